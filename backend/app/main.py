@@ -6,15 +6,21 @@ Main application entry point.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import multiprocessing
+import os
+import sys
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-load_dotenv()  # Load .env before any service imports
+load_dotenv()  # Load .env before module-level settings and service imports
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.models.schemas import (
     AnalysisResponse,
@@ -24,17 +30,6 @@ from app.models.schemas import (
     LexicalMetrics,
     RiskScores,
 )
-from app.services.audio_features import extract_features
-from app.services.risk_engine import (
-    compare_to_baseline,
-    compute_acoustic_risk,
-    compute_cognitive_risk,
-    compute_cognitive_score,
-    compute_final_neuro_risk,
-    generate_explanation,
-    lexical_analysis_placeholder,
-    run_lexical_analysis,
-)
 
 # ─── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -43,40 +38,152 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cognitive-echo")
 
+# ─── Upload Limits ────────────────────────────────────────────────────────────
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+MIN_UPLOAD_BYTES = 100
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# ─── CORS ─────────────────────────────────────────────────────────────────────
+# Comma-separated list of allowed origins (add production frontends here)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
+    ).split(",")
+    if origin.strip()
+]
+CORS_MAX_AGE_SECONDS = 600
+
+# ─── Silent Audio Detection ───────────────────────────────────────────────────
+# Recordings below this pitch / above this pause ratio carry no usable speech,
+# so the lexical pipeline (STT + LLM) is skipped for them
+SILENT_MAX_PITCH_HZ = 50.0
+SILENT_MIN_PAUSE_RATIO = 0.95
+
+# Lexical result reported when the silence check skips STT/LLM analysis
+SILENT_LEXICAL_RESULT = {
+    "status": "unavailable",
+    "error_type": "silent_audio",
+    "message": "Audio appears silent; lexical analysis was skipped.",
+    "cognitive_concern": "Unknown",
+}
+
+# ─── Acoustic-Only Messaging ──────────────────────────────────────────────────
+LEXICAL_UNAVAILABLE_NOTE = (
+    " Note: Lexical analysis was unavailable for this session. "
+    "Risk assessment is based on acoustic data only."
+)
+LEXICAL_UNAVAILABLE_RECOMMENDATION = (
+    "Re-record and retry when the lexical analysis service is available "
+    "for a more comprehensive assessment."
+)
+
+# ─── CPU Offload ──────────────────────────────────────────────────────────────
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+
+# Acoustic scoring micro-batches: concurrent requests arriving within the
+# window share one batched model call (0 disables batching)
+ACOUSTIC_BATCH_WINDOW_MS = float(os.getenv("ACOUSTIC_BATCH_WINDOW_MS", "5"))
+ACOUSTIC_BATCH_MAX = int(os.getenv("ACOUSTIC_BATCH_MAX", "32"))
+
 # ─── App Lifecycle ────────────────────────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🧠 Cognitive Echo Sentinel backend starting…")
 
+    # ── Pipeline Services ──
+    # Imported here rather than at module scope: they pull in librosa,
+    # parselmouth, sklearn and the pickled model, which would otherwise
+    # stall every `import app.main` (reloader, CLI tooling, worker boot).
+    from app.services import audio_features, risk_engine
+    app.state.extract_features = audio_features.extract_features
+    app.state.scoring_inputs = risk_engine.ScoringInputs.from_dict
+    app.state.compare_to_baseline = risk_engine.compare_to_baseline
+    app.state.compute_acoustic_risk = risk_engine.compute_acoustic_risk
+    app.state.fuse_scores = risk_engine.fuse_scores
+    app.state.generate_explanation = risk_engine.generate_explanation
+    app.state.run_lexical_analysis = risk_engine.run_lexical_analysis
+
     # ── Audio Pipeline Status ──
-    from app.services.audio_features import LIBROSA_AVAILABLE, PRAAT_AVAILABLE
-    if LIBROSA_AVAILABLE:
+    if audio_features.LIBROSA_AVAILABLE:
         logger.info("✅ AUDIO_PIPELINE=REAL (librosa loaded)")
     else:
         logger.warning("⚠️ AUDIO_PIPELINE=MOCK (librosa missing)")
-    if PRAAT_AVAILABLE:
+    if audio_features.PRAAT_AVAILABLE:
         logger.info("✅ PRAAT_PIPELINE=REAL (parselmouth loaded)")
     else:
         logger.warning("⚠️ PRAAT_PIPELINE=MOCK (parselmouth missing)")
 
-    # ── ML Model Status ──
-    from app.services.risk_engine import _ml_ready
-    if _ml_ready:
-        logger.info("✅ ML_MODEL=LOADED (neuro_risk_model.pkl)")
-    else:
-        logger.warning("⚠️ ML_MODEL=HEURISTIC_FALLBACK (model not loaded)")
-
     # ── LLM API Key Status ──
-    import os
     if os.getenv("FEATHERLESS_API_KEY"):
         logger.info("✅ FEATHERLESS_API_KEY=CONFIGURED")
     else:
         logger.warning("⚠️ FEATHERLESS_API_KEY=MISSING (lexical analysis will fail)")
 
+    # ── Scoring Kernels (JIT warm-up; also fills the on-disk cache for workers) ──
+    risk_engine.warmup_kernels()
+    if risk_engine.NUMBA_AVAILABLE:
+        logger.info("✅ SCORING_KERNELS=JIT (numba compiled)")
+    else:
+        logger.warning("⚠️ SCORING_KERNELS=PYTHON (numba missing)")
+
+    # ── CPU Worker Pool ──
+    # spawn, not fork: the parent already runs numba/BLAS/HTTP threads, and a
+    # forked child would inherit their locks in whatever state they were in
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=ANALYSIS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_analysis_worker,
+    )
+    # The first task spawns a worker, whose initializer loads the model
+    ml_ready = await asyncio.get_running_loop().run_in_executor(
+        app.state.pool, risk_engine.ml_model_ready
+    )
+    logger.info("✅ ANALYSIS_WORKERS=%d (spawned process pool)", ANALYSIS_WORKERS)
+
+    # ── ML Model Status (loaded in the workers, not in this process) ──
+    if ml_ready:
+        logger.info("✅ ML_MODEL=LOADED (neuro_risk_model)")
+    else:
+        logger.warning("⚠️ ML_MODEL=HEURISTIC_FALLBACK (model not loaded)")
+
+    # ── Acoustic Micro-Batching ──
+    app.state.acoustic_batcher = None
+    if ACOUSTIC_BATCH_WINDOW_MS > 0:
+        from app.services.acoustic_batcher import AcousticBatcher
+
+        async def _score_acoustic_batch(features_list, baselines):
+            return await _run_in_pool(risk_engine.compute_acoustic_risk_batch, features_list, baselines)
+
+        app.state.acoustic_batcher = AcousticBatcher(
+            _score_acoustic_batch,
+            max_batch=ACOUSTIC_BATCH_MAX,
+            window_seconds=ACOUSTIC_BATCH_WINDOW_MS / 1000.0,
+        )
+        app.state.acoustic_batcher.start()
+        logger.info(
+            "✅ ACOUSTIC_BATCHING=ON (window=%g ms, max=%d)",
+            ACOUSTIC_BATCH_WINDOW_MS, ACOUSTIC_BATCH_MAX,
+        )
+
+    # ── Event Loop ──
+    loop = asyncio.get_running_loop()
+    logger.info("✅ EVENT_LOOP=%s.%s", type(loop).__module__, type(loop).__qualname__)
+
     logger.info("🚀 Backend ready for requests")
     yield
     logger.info("Shutting down…")
+    if app.state.acoustic_batcher is not None:
+        await app.state.acoustic_batcher.aclose()
+    app.state.pool.shutdown(cancel_futures=True)
+
+    from app.services.lexical_analyzer import aclose_http_client
+    from app.services.lexical_cache import aclose_redis_client
+    from app.services.transcription import aclose_http_client as aclose_stt_client
+    await aclose_http_client()
+    await aclose_stt_client()
+    await aclose_redis_client()
 
 
 # ─── FastAPI App ──────────────────────────────────────────────────────────────
@@ -86,15 +193,18 @@ app = FastAPI(
     description="AI-powered cognitive health assessment through voice biomarker analysis",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS – allow the Next.js dev server and production origins
+# CORS – explicit origins (a "*" entry is invalid alongside credentials);
+# preflights are cached by the browser for CORS_MAX_AGE_SECONDS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=CORS_MAX_AGE_SECONDS,
 )
 
 
@@ -105,6 +215,81 @@ async def health():
     return {"status": "ok", "service": "cognitive-echo-sentinel"}
 
 
+# ─── CPU Offload Helpers ─────────────────────────────────────────────────────
+
+def _init_analysis_worker() -> None:
+    """Pool initializer: import the pipeline, warm the JIT kernels and load the model once per worker."""
+    from app.services import audio_features, risk_engine
+
+    # One BLAS thread per worker: the pool already runs one process per core.
+    # Set once here because threadpool_limits is process-wide, so a
+    # per-request context would race between overlapping extractions.
+    if audio_features.threadpool_limits is not None:
+        audio_features.threadpool_limits(limits=1)
+
+    audio_features.warmup_kernels()
+    risk_engine.warmup_kernels()
+    risk_engine.warmup_model()
+
+
+async def _run_in_pool(func, *args):
+    """Run a CPU-bound pipeline step in the worker pool off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.pool, func, *args)
+
+
+# ─── Lexical Pipeline ────────────────────────────────────────────────────────
+
+async def _run_lexical_pipeline(audio_bytes: bytearray, speech_detected: asyncio.Future) -> dict:
+    """
+    Groq Whisper STT -> Featherless AI lexical analysis.
+
+    STT starts right away so its upload overlaps the acoustic DSP, but the
+    Featherless call waits on `speech_detected`, which analyze_audio
+    resolves once extraction has decided whether the audio is silent.
+    Silent recordings therefore never reach the LLM.
+    """
+    from app.services.transcription import transcribe_audio
+    transcript = await transcribe_audio(audio_bytes)
+
+    if not await speech_detected:
+        return dict(SILENT_LEXICAL_RESULT)
+    if transcript:
+        return await app.state.run_lexical_analysis(transcript)
+    return {"status": "unavailable", "cognitive_concern": "Unknown"}
+
+
+# ─── Upload Streaming ────────────────────────────────────────────────────────
+
+async def _read_upload(file: UploadFile) -> bytearray:
+    """
+    Stream an upload into a single bounded buffer.
+
+    The buffer is preallocated from the declared part size when the client
+    sends one and filled chunk by chunk, so reading does not build a second
+    full-size copy (no b"".join).  Later steps still copy it: the worker pool
+    pickles it to the extraction process and transcription wraps it in a
+    BytesIO.  Raises 413 past MAX_UPLOAD_BYTES and 400 below MIN_UPLOAD_BYTES.
+    """
+    declared = file.size or 0
+    if declared > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Audio file is too large.")
+
+    buf = bytearray(declared)
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        end = size + len(chunk)
+        if end > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Audio file is too large.")
+        buf[size:end] = chunk
+        size = end
+    del buf[size:]
+
+    if size < MIN_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="Audio file is too small or empty.")
+    return buf
+
+
 # ─── Main Analysis Endpoint ──────────────────────────────────────────────────
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
@@ -121,9 +306,7 @@ async def analyze_audio(
 
     # 1. Read audio bytes
     try:
-        audio_bytes = await file.read()
-        if len(audio_bytes) < 100:
-            raise HTTPException(status_code=400, detail="Audio file is too small or empty.")
+        audio_bytes = await _read_upload(file)
     except HTTPException:
         raise
     except Exception as e:
@@ -132,44 +315,58 @@ async def analyze_audio(
 
     logger.info("Audio size: %d bytes", len(audio_bytes))
 
-    # 2. Extract acoustic features
-    features = extract_features(audio_bytes)
-    duration = features.pop("_duration", 5.0)
-    logger.info("Extracted features – pitch=%.1f Hz, jitter=%.2f%%", features["mean_pitch_hz"], features["jitter_percent"])
-
-    # 3. Baseline comparison (Vocal Twin)
-    baseline = compare_to_baseline(features)
-    logger.info("Baseline comparison – deviation=%.1f, status=%s", baseline["deviation_score"], baseline["status"])
-
-    # 4. Acoustic Risk Score
-    acoustic_risk = compute_acoustic_risk(features, baseline)
-    logger.info("Acoustic risk score: %.1f", acoustic_risk)
-
-    # 5. Lexical Pipeline (Conditional)
-    lexical_result = None
-    
+    # 1b. Start the lexical pipeline so the STT round-trip overlaps with the
+    #     local acoustic DSP below; the LLM step is gated on the silence check
+    lex_task = None
+    speech_detected = asyncio.get_running_loop().create_future()
     if mode == "free_speech":
-        # 5b. Groq Whisper STT -> Featherless AI lexical analysis
-        from app.services.transcription import transcribe_audio
-        transcript = await transcribe_audio(audio_bytes)
-        
-        if transcript:
-            lexical_result = await run_lexical_analysis(transcript)
-        else:
-            lexical_result = {"status": "unavailable", "cognitive_concern": "Unknown"}
+        lex_task = asyncio.create_task(_run_lexical_pipeline(audio_bytes, speech_detected))
     else:
         logger.info("Skipping Lexical Analysis (mode=%s)", mode)
+
+    try:
+        # 2. Extract acoustic features
+        features = await _run_in_pool(app.state.extract_features, audio_bytes)
+        duration = features.pop("_duration", 5.0)
+        silent = (
+            features.pop("_silent", False)
+            or features["mean_pitch_hz"] < SILENT_MAX_PITCH_HZ
+            or features["pause_ratio"] > SILENT_MIN_PAUSE_RATIO
+        )
+        logger.info("Extracted features – pitch=%.1f Hz, jitter=%.2f%%", features["mean_pitch_hz"], features["jitter_percent"])
+        # Scalar view read by the scoring steps (the dict stays for the response)
+        inputs = app.state.scoring_inputs(features)
+        speech_detected.set_result(not silent)
+        if silent and lex_task is not None:
+            # Nothing to transcribe – drop the in-flight STT round-trip (the
+            # gate above already keeps the pipeline from calling the LLM)
+            lex_task.cancel()
+            logger.info("Skipping Lexical Analysis (audio appears silent)")
+
+        # 3. Baseline comparison (Vocal Twin) – a few float ops, cheaper
+        #    inline than a round-trip to the worker pool
+        baseline = app.state.compare_to_baseline(inputs)
+        logger.info("Baseline comparison – deviation=%.1f, status=%s", baseline.deviation_score, baseline.status)
+    except BaseException:
+        if lex_task is not None:
+            lex_task.cancel()
+        raise
+
+    # 4. Lexical Pipeline (Conditional)
+    if lex_task is not None and silent:
+        lexical_result = dict(SILENT_LEXICAL_RESULT)
+    elif lex_task is not None:
+        lexical_result = await lex_task
+    else:
         lexical_result = {"status": "skipped", "cognitive_concern": "Unknown"}
 
-    # 6. Determine lexical availability
+    # 5. Determine lexical availability
     lexical_status = lexical_result.get("status", "unavailable")
     cognitive_available = lexical_status == "success"
 
     if cognitive_available:
         logger.info("Lexical metrics: %s", lexical_result)
-        cognitive_score = compute_cognitive_score(lexical_result)
-        logger.info("Cognitive score (lexical): %.1f", cognitive_score)
-        
+
         # Real mapped lexical data
         lexical = {
             "vocabulary_richness": lexical_result.get("vocabulary_richness", 0) * 100,
@@ -178,7 +375,7 @@ async def analyze_audio(
             "summary": "AI lexical analysis completed successfully based on semantic and structural patterns."
         }
 
-        lexical_metrics_obj = LexicalMetrics(
+        lexical_metrics_obj = LexicalMetrics.model_construct(
             vocabulary_richness=lexical_result["vocabulary_richness"],
             sentence_coherence=lexical_result["sentence_coherence"],
             word_finding_difficulty=lexical_result["word_finding_difficulty"],
@@ -194,42 +391,43 @@ async def analyze_audio(
             lexical_result.get("message", "No details"),
         )
         lexical = None
-        cognitive_score = None
         lexical_metrics_obj = None
         cognitive_concern = None
         lexical_error = lexical_result.get("message")
 
-    # 7. Final Neuro Risk (acoustic + cognitive fusion, or acoustic-only)
-    risk = compute_final_neuro_risk(acoustic_risk, cognitive_score)
+    # 6. Acoustic risk + cognitive score + final neuro risk (acoustic-only
+    #    when lexical metrics are unavailable)
+    lexical_metrics = lexical_result if cognitive_available else None
+    if app.state.acoustic_batcher is not None:
+        acoustic_risk = await app.state.acoustic_batcher.score(inputs, baseline)
+    else:
+        acoustic_risk = await _run_in_pool(app.state.compute_acoustic_risk, inputs, baseline)
+    risk = app.state.fuse_scores(acoustic_risk, lexical_metrics)
     logger.info(
-        "Final neuro risk: level=%s, cognitive_available=%s",
-        risk["neuro_risk_level"], cognitive_available,
+        "Final neuro risk: acoustic=%.1f, level=%s, cognitive_available=%s",
+        risk.acoustic_risk_score, risk.neuro_risk_level, cognitive_available,
     )
 
-    # 8. Explanation
-    explanation, recommendations = generate_explanation(features, baseline, risk, lexical)
+    # 7. Explanation
+    explanation, recommendations = app.state.generate_explanation(features, baseline, risk, lexical)
 
     if not cognitive_available:
-        explanation += (
-            " Note: Lexical analysis was unavailable for this session. "
-            "Risk assessment is based on acoustic data only."
-        )
-        recommendations.append(
-            "Re-record and retry when the lexical analysis service is available "
-            "for a more comprehensive assessment."
-        )
+        explanation += LEXICAL_UNAVAILABLE_NOTE
+        recommendations.append(LEXICAL_UNAVAILABLE_RECOMMENDATION)
 
-    # 9. Build response
-    session_id = str(uuid.uuid4())
+    # 8. Build response
+    session_id = uuid.uuid4().hex
 
-    return AnalysisResponse(
+    # Internal data is already well-typed; skip per-model validation here and
+    # let the route's response_model validate the response once.
+    return AnalysisResponse.model_construct(
         session_id=session_id,
         duration_seconds=duration,
-        acoustic_features=AcousticFeatures(**features),
-        baseline_comparison=BaselineComparison(**baseline),
-        lexical_analysis=LexicalAnalysis(**lexical) if lexical else None,
+        acoustic_features=AcousticFeatures.model_construct(**features),
+        baseline_comparison=BaselineComparison.model_construct(**baseline.to_dict()),
+        lexical_analysis=LexicalAnalysis.model_construct(**lexical) if lexical else None,
         lexical_metrics=lexical_metrics_obj,
-        risk_scores=RiskScores(**risk),
+        risk_scores=RiskScores.model_construct(**risk.to_dict()),
         cognitive_available=cognitive_available,
         lexical_status=lexical_status,
         lexical_error_message=lexical_error,
@@ -237,3 +435,21 @@ async def analyze_audio(
         explanation=explanation,
         recommendations=recommendations,
     )
+
+
+# ─── Production Entry Point ──────────────────────────────────────────────────
+# `python -m app.main` serves with uvloop + httptools (both shipped with
+# uvicorn[standard]; uvloop is unavailable on Windows). Each web worker owns
+# its own analysis process pool, so keep WEB_CONCURRENCY low.
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("BACKEND_HOST", "127.0.0.1"),
+        port=int(os.getenv("BACKEND_PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -2,11 +2,17 @@
 Pydantic models for Cognitive Echo Sentinel API.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Any, Optional
 
 
-class AcousticFeatures(BaseModel):
+class _Schema(BaseModel):
+    """Shared config: immutable, ignore unknown keys, populate by field name."""
+
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+
+class AcousticFeatures(_Schema):
     """Raw acoustic feature values extracted from voice sample."""
 
     mfcc_mean: list[float] = Field(description="Mean MFCC coefficients (13 values)")
@@ -21,7 +27,7 @@ class AcousticFeatures(BaseModel):
     harmonics_to_noise: float = Field(description="Harmonics-to-noise ratio (dB)")
 
 
-class BaselineComparison(BaseModel):
+class BaselineComparison(_Schema):
     """Vocal Twin baseline comparison results."""
 
     deviation_score: float = Field(description="Overall deviation from baseline (0-100)")
@@ -31,7 +37,7 @@ class BaselineComparison(BaseModel):
     status: str = Field(description="normal | mild_drift | significant_drift | critical_drift")
 
 
-class LexicalAnalysis(BaseModel):
+class LexicalAnalysis(_Schema):
     """Placeholder LLM-based lexical analysis."""
 
     coherence_score: float = Field(description="Semantic coherence (0-100)")
@@ -40,7 +46,7 @@ class LexicalAnalysis(BaseModel):
     summary: str = Field(description="Brief AI-generated narrative")
 
 
-class LexicalMetrics(BaseModel):
+class LexicalMetrics(_Schema):
     """Featherless AI cognitive-linguistic analysis metrics."""
 
     vocabulary_richness: float = Field(description="Lexical diversity (0-1)")
@@ -50,7 +56,7 @@ class LexicalMetrics(BaseModel):
     cognitive_concern: str = Field(description="Low | Medium | High")
 
 
-class RiskScores(BaseModel):
+class RiskScores(_Schema):
     """Computed risk indicators."""
 
     acoustic_risk_score: float = Field(description="Acoustic risk (0-100)")
@@ -60,7 +66,7 @@ class RiskScores(BaseModel):
     cognitive_available: bool = Field(default=True, description="Whether cognitive scoring was available")
 
 
-class AnalysisResponse(BaseModel):
+class AnalysisResponse(_Schema):
     """Full response returned by POST /api/analyze."""
 
     session_id: str
@@ -0,0 +1,107 @@
+"""
+Micro-batching for acoustic risk scoring.
+
+Concurrent /api/analyze requests each need one acoustic risk score.  Scored
+one at a time, every request pays the fixed per-call cost of the ML model
+(predict_proba dispatch, the sklearn forest's thread fan-out) for a single
+row.  The batcher queues (features, baseline) pairs, waits a short window
+after the first arrival, and hands everything collected to one
+compute_acoustic_risk_batch call — one (N, 28) predict_proba instead of N.
+
+Batches are dispatched as independent tasks, so a slow batch never holds
+back the next window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Sequence
+
+logger = logging.getLogger("cognitive-echo.acoustic-batcher")
+
+# (features_list, baselines) -> one acoustic risk score per row
+BatchScorer = Callable[[Sequence[Any], Sequence[Any]], Awaitable[Sequence[float]]]
+
+
+class AcousticBatcher:
+    """Coalesce acoustic scoring requests into batched calls."""
+
+    def __init__(
+        self,
+        score_batch: BatchScorer,
+        *,
+        max_batch: int = 32,
+        window_seconds: float = 0.005,
+    ) -> None:
+        self._score_batch = score_batch
+        self._max_batch = max_batch
+        self._window_seconds = window_seconds
+        self._queue: asyncio.Queue[tuple[Any, Any, asyncio.Future]] = asyncio.Queue()
+        self._collector: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the background collector (call from within the running loop)."""
+        if self._collector is None:
+            self._collector = asyncio.create_task(self._collect())
+
+    async def aclose(self) -> None:
+        """Stop collecting and fail any requests still waiting in the queue."""
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Acoustic batcher is shut down."))
+
+    async def score(self, features: Any, baseline: Any) -> float:
+        """Queue one recording and wait for its acoustic risk score."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, baseline, future))
+        return await future
+
+    # ─── Internal Helpers ─────────────────────────────────────────────────────
+
+    async def _collect(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Fixed window after the first arrival, then drain what queued up
+            await asyncio.sleep(self._window_seconds)
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, Any, asyncio.Future]]) -> None:
+        # Requests whose client went away are dropped before scoring
+        live = [item for item in batch if not item[2].done()]
+        if not live:
+            return
+
+        try:
+            scores = await self._score_batch(
+                [features for features, _, _ in live],
+                [baseline for _, baseline, _ in live],
+            )
+        except Exception as exc:
+            logger.error("Batched acoustic scoring failed (%d rows): %s", len(live), exc)
+            for _, _, future in live:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, _, future), score in zip(live, scores):
+            if not future.done():
+                future.set_result(float(score))
+        if len(live) > 1 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scored %d recordings in one batch", len(live))
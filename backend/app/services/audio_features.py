@@ -7,18 +7,18 @@ Falls back to realistic mock data when audio libraries are unavailable.
 
 from __future__ import annotations
 
+import importlib.util
 import io
 import logging
 import math
-import random
-import uuid
-import subprocess
-import tempfile
 import os
-from pathlib import Path
+import random
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from app.services.jit import njit
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -43,6 +43,31 @@ except ImportError as e:
     PRAAT_AVAILABLE = False
     logger.warning("MOCK_AUDIO_PIPELINE_ACTIVE: parselmouth not installed (%s)", e)
 
+# torch/torchaudio are only looked up here and imported on the first F0
+# estimate: importing torch (and probing CUDA) in the web process and every
+# pool worker would cost seconds of start-up, and on a GPU host each worker
+# would create its own CUDA context.  The device is opt-in via F0_DEVICE.
+TORCHAUDIO_AVAILABLE = (
+    importlib.util.find_spec("torch") is not None
+    and importlib.util.find_spec("torchaudio") is not None
+)
+F0_DEVICE = os.getenv("F0_DEVICE", "cpu")
+if TORCHAUDIO_AVAILABLE:
+    logger.info("F0_ESTIMATOR=torchaudio (%s)", F0_DEVICE)
+
+try:
+    import av
+
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+    logger.warning("PyAV not installed – only formats libsndfile can read will decode (no WebM/Opus)")
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # shipped with scikit-learn; only missing in trimmed installs
+    threadpool_limits = None
+
 # One-Time Startup Banner
 if LIBROSA_AVAILABLE:
     logger.info("🎤 Audio Pipeline Status: REAL")
@@ -50,6 +75,27 @@ else:
     logger.warning("⚠️ Audio Pipeline Status: MOCK (librosa missing)")
 
 
+# pyin dominates extraction time and spends it in numpy/numba kernels,
+# so it runs on this thread while the cheaper branches run inline
+_F0_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-f0")
+
+HNR_SAMPLE_RATE = 8_000
+
+# F0 search range (C2–C5), resolved once instead of per request
+_F0_FMIN_HZ = float(librosa.note_to_hz("C2")) if LIBROSA_AVAILABLE else 65.41
+_F0_FMAX_HZ = float(librosa.note_to_hz("C5")) if LIBROSA_AVAILABLE else 523.25
+
+
+# Response keys of the 9 scalar measurements and their rounding scale
+# (4 or 2 decimals), in the order _extract_real packs them
+_SCALAR_KEYS = (
+    "jitter_percent", "shimmer_percent", "mean_pitch_hz", "pitch_std_hz",
+    "pitch_stability", "pause_ratio", "speech_rate", "harmonics_to_noise",
+    "_duration",
+)
+_SCALAR_SCALE = np.array([1e4, 1e4, 1e2, 1e2, 1e4, 1e4, 1e2, 1e2, 1e2])
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -68,137 +114,185 @@ def extract_features(audio_bytes: bytes, sample_rate: int = 16_000) -> dict:
     return _extract_mock()
 
 
+def warmup_kernels() -> None:
+    """
+    Compile the DSP kernels (or load them from numba's on-disk cache).
+
+    Called from the pool worker initializer, so neither module import nor
+    the first extraction pays the JIT cost.
+    """
+    _hnr_kernel(np.zeros(2))
+
+
 # ---------------------------------------------------------------------------
 # Real extraction (when libs available)
 # ---------------------------------------------------------------------------
 
-def convert_webm_to_wav(input_path: str) -> str:
+def _decode_audio(audio_bytes: bytes, sr: int) -> np.ndarray:
     """
-    Convert WebM/Opus audio to WAV using FFmpeg.
-    Returns path to WAV file.
+    Decode an upload (WebM/Opus, WAV, MP3, ...) to mono float32 at `sr`.
+
+    Decoding happens fully in memory: PyAV (bundled FFmpeg libraries) decodes
+    and resamples in one pass; without it, librosa/soundfile read the bytes
+    directly, which covers WAV/FLAC/OGG but not WebM.
     """
-    output_path = str(Path(input_path).with_suffix(".wav"))
+    if not PYAV_AVAILABLE:
+        y, _ = librosa.load(io.BytesIO(audio_bytes), sr=sr, mono=True)
+        return y
 
-    try:
-        process = subprocess.run(
-            ["ffmpeg", "-y", "-i", input_path, output_path],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        logger.info("🎧 Converted WebM → WAV successfully")
-        return output_path
+    chunks: list[np.ndarray] = []
+    with av.open(io.BytesIO(audio_bytes)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sr)
+        for frame in container.decode(stream):
+            chunks.extend(out.to_ndarray()[0] for out in resampler.resample(frame))
+        chunks.extend(out.to_ndarray()[0] for out in resampler.resample(None))
+
+    if not chunks:
+        raise ValueError("no audio samples decoded")
+    return np.concatenate(chunks)
 
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ FFmpeg conversion failed with exit code {e.returncode}. Stderr: {e.stderr}")
-        return input_path
-    except Exception as e:
-        logger.error(f"❌ FFmpeg conversion crashed: {e}")
-        return input_path
 
 def _extract_real(audio_bytes: bytes, sr: int) -> dict:
     """Extract features using librosa + parselmouth."""
 
-    # 1. Safely handle WebM → WAV conversion
-    # Create a temporary WebM file for ffmpeg
-    with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp_webm:
-        tmp_webm.write(audio_bytes)
-        webm_path = tmp_webm.name
-
+    # 1. Decode the upload in memory (no temp files / ffmpeg subprocess)
     try:
-        # Convert it
-        wav_path = convert_webm_to_wav(webm_path)
-        
-        # Load audio from the converted WAV file
-        try:
-            y, sr = librosa.load(wav_path, sr=sr, mono=True)
-        except ModuleNotFoundError as e:
-            logger.error(f"🚨 CRITICAL: Missing dependency preventing extraction: {e}. Refusing to fall back to mock.")
-            raise
-        except Exception as e:
-            logger.error("MOCK_AUDIO_PIPELINE_ACTIVE: librosa failed to decode audio format (%s). WebM Opus requires system FFmpeg. Falling back to mock acoustics.", e)
-            return _extract_mock()
-            
-    finally:
-        # Cleanup temporary audio files
-        try:
-            os.remove(webm_path)
-            if 'wav_path' in locals() and wav_path != webm_path and os.path.exists(wav_path):
-                os.remove(wav_path)
-        except Exception:
-            pass
-        
+        y = _decode_audio(audio_bytes, sr)
+    except ModuleNotFoundError as e:
+        logger.error(f"🚨 CRITICAL: Missing dependency preventing extraction: {e}. Refusing to fall back to mock.")
+        raise
+    except Exception as e:
+        logger.error("MOCK_AUDIO_PIPELINE_ACTIVE: failed to decode audio format (%s). WebM Opus requires PyAV. Falling back to mock acoustics.", e)
+        return _extract_mock()
+
     duration = librosa.get_duration(y=y, sr=sr)
 
-    # ---- MFCC ----
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-    mfcc_mean = mfcc.mean(axis=1).tolist()
-    mfcc_std = mfcc.std(axis=1).tolist()
+    # BLAS is capped at one thread per worker process by the pool initializer
+    # (main._init_analysis_worker), so the F0 branch and the inline branches
+    # below do not oversubscribe the cores
+    f0_future = _F0_EXECUTOR.submit(_estimate_f0, y, sr)
 
-    # ---- Pitch (via librosa pyin) ----
-    f0, voiced_flag, _ = librosa.pyin(
-        y, fmin=librosa.note_to_hz("C2"), fmax=librosa.note_to_hz("C7"), sr=sr
-    )
-    f0_clean = f0[~np.isnan(f0)] if f0 is not None else np.array([150.0])
-    mean_pitch = float(np.mean(f0_clean)) if len(f0_clean) > 0 else 150.0
-    pitch_std = float(np.std(f0_clean)) if len(f0_clean) > 0 else 10.0
-    pitch_stability = max(0.0, min(1.0, 1.0 - (pitch_std / (mean_pitch + 1e-6))))
+    # ---- Shared spectrogram (one STFT + mel projection feeds MFCC and onsets) ----
+    mag = np.abs(librosa.stft(y, n_fft=2048, hop_length=512))
+    mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=mag**2, sr=sr))
+
+    # ---- MFCC ----
+    mfcc = librosa.feature.mfcc(S=mel_db, sr=sr, n_mfcc=13)
+    mfcc_mean = mfcc.mean(axis=1, dtype=np.float64)
+    mfcc_std = mfcc.std(axis=1, dtype=np.float64)
 
     # ---- Pause / silence ratio ----
     rms = librosa.feature.rms(y=y)[0]
-    silence_threshold = np.mean(rms) * 0.3
-    silence_frames = np.sum(rms < silence_threshold)
+    silence_frames = np.count_nonzero(rms < 0.3 * rms.mean())
     pause_ratio = float(silence_frames / (len(rms) + 1e-6))
 
     # ---- Speech rate (approximate via onset detection) ----
-    onsets = librosa.onset.onset_detect(y=y, sr=sr, units="time")
+    onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr)
+    onsets = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr, units="time")
     speech_rate = float(len(onsets) / max(duration, 0.1))
 
     # ---- HNR (simple approximation) ----
     hnr = _compute_hnr(y, sr)
 
     # ---- Jitter / Shimmer ----
-    jitter, shimmer = _compute_jitter_shimmer(audio_bytes, sr)
+    jitter, shimmer = _compute_jitter_shimmer(y, sr)
 
-    return {
-        "mfcc_mean": [round(v, 4) for v in mfcc_mean],
-        "mfcc_std": [round(v, 4) for v in mfcc_std],
-        "jitter_percent": round(jitter, 4),
-        "shimmer_percent": round(shimmer, 4),
-        "mean_pitch_hz": round(mean_pitch, 2),
-        "pitch_std_hz": round(pitch_std, 2),
-        "pitch_stability": round(pitch_stability, 4),
-        "pause_ratio": round(pause_ratio, 4),
-        "speech_rate": round(speech_rate, 2),
-        "harmonics_to_noise": round(hnr, 2),
-        "_duration": round(duration, 2),
+    # ---- Pitch ----
+    f0_clean = f0_future.result()
+
+    mean_pitch = float(np.mean(f0_clean)) if len(f0_clean) > 0 else 150.0
+    pitch_std = float(np.std(f0_clean)) if len(f0_clean) > 0 else 10.0
+    pitch_stability = max(0.0, min(1.0, 1.0 - (pitch_std / (mean_pitch + 1e-6))))
+
+    scalars = np.array([
+        jitter, shimmer, mean_pitch, pitch_std, pitch_stability,
+        pause_ratio, speech_rate, hnr, duration,
+    ])
+    # One vectorized rounding pass, written straight into the response dict
+    rounded = (np.round(scalars * _SCALAR_SCALE) / _SCALAR_SCALE).tolist()
+    features = {
+        "mfcc_mean": np.round(mfcc_mean, 4).tolist(),
+        "mfcc_std": np.round(mfcc_std, 4).tolist(),
     }
+    features.update(zip(_SCALAR_KEYS, rounded))
+    features["_silent"] = len(f0_clean) == 0
+    return features
+
+
+def _estimate_f0(y: np.ndarray, sr: int) -> np.ndarray:
+    """
+    Return the voiced F0 track in Hz (unvoiced frames removed).
+
+    Uses torchaudio's NCCF pitch detector (on GPU when available) if installed,
+    otherwise librosa.pyin restricted to the speech range (C2–C5) with short,
+    uncentred frames to keep its Viterbi pass small.
+    """
+    fmin = _F0_FMIN_HZ
+    fmax = _F0_FMAX_HZ
+
+    if TORCHAUDIO_AVAILABLE:
+        import torch
+        import torchaudio
+
+        with torch.inference_mode():
+            wav = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).to(F0_DEVICE)
+            f0 = torchaudio.functional.detect_pitch_frequency(
+                wav, sr, freq_low=int(fmin), freq_high=int(fmax)
+            ).cpu().numpy()
+
+        # No voicing decision in the NCCF detector: keep in-range frames that
+        # carry at least 10% of the peak frame energy (10 ms frames)
+        frame = math.ceil(sr * 0.01)
+        padded = np.zeros(len(f0) * frame, dtype=np.float32)
+        padded[: min(len(y), len(padded))] = y[: len(padded)]
+        energy = np.sqrt(np.mean(padded.reshape(len(f0), frame) ** 2, axis=1))
+        voiced = (energy > 0.1 * energy.max()) & (f0 >= fmin) & (f0 <= fmax)
+        return f0[voiced]
+
+    f0, _, _ = librosa.pyin(
+        y, fmin=fmin, fmax=fmax, sr=sr,
+        frame_length=1024, hop_length=256, center=False,
+    )
+    return f0[~np.isnan(f0)]
 
 
 def _compute_hnr(y: np.ndarray, sr: int) -> float:
-    """Approximate HNR using autocorrelation."""
-    try:
-        frame_len = min(len(y), sr // 4)
-        frame = y[:frame_len]
-        autocorr = np.correlate(frame, frame, mode="full")
-        autocorr = autocorr[len(autocorr) // 2 :]
-        if autocorr[0] == 0:
-            return 15.0
-        peak = np.max(autocorr[1:]) / autocorr[0]
-        hnr = 10 * math.log10(peak / (1 - peak + 1e-10) + 1e-10)
-        return max(0.0, min(40.0, hnr))
-    except Exception:
+    """Approximate HNR using (FFT-based) autocorrelation on the first 250 ms at 8 kHz."""
+    frame = y[: sr // 4]
+    if len(frame) < 2:
+        return 15.0
+    # Voice harmonics that matter for HNR sit below 4 kHz: decimate first
+    if sr > HNR_SAMPLE_RATE:
+        frame = librosa.resample(frame, orig_sr=sr, target_sr=HNR_SAMPLE_RATE)
+    frame_len = len(frame)
+    # FFT autocorrelation (zero-padded to avoid circular wrap): O(N log N)
+    n_fft = 1 << (2 * frame_len - 1).bit_length()
+    spec = np.fft.rfft(frame, n_fft)
+    autocorr = np.fft.irfft(spec * np.conj(spec), n_fft)[:frame_len]
+    return _hnr_kernel(autocorr)
+
+
+@njit(cache=True, fastmath=True)
+def _hnr_kernel(autocorr: np.ndarray) -> float:
+    """Peak-to-zero-lag ratio of an autocorrelation -> HNR in dB (0-40, 15 if undefined)."""
+    n = autocorr.shape[0]
+    if n < 2 or autocorr[0] <= 0.0:
         return 15.0
+    peak = autocorr[1]
+    for i in range(2, n):
+        peak = max(peak, autocorr[i])
+    # Clip the normalized peak into (0, 1) so the log ratio is always finite
+    peak = min(max(peak / autocorr[0], 1e-6), 1.0 - 1e-6)
+    return min(max(10.0 * math.log10(peak / (1.0 - peak)), 0.0), 40.0)
 
 
-def _compute_jitter_shimmer(audio_bytes: bytes, sr: int) -> tuple[float, float]:
-    """Compute jitter and shimmer via parselmouth if available."""
+def _compute_jitter_shimmer(y: np.ndarray, sr: int) -> tuple[float, float]:
+    """Compute jitter and shimmer via parselmouth (on the already-decoded signal) if available."""
     if not PRAAT_AVAILABLE:
         return _mock_jitter_shimmer()
     try:
-        snd = parselmouth.Sound(io.BytesIO(audio_bytes))
-        snd = snd.resample_new_frequency(sr)
+        snd = parselmouth.Sound(values=y.astype(np.float64), sampling_frequency=sr)
         point_process = praat_call(
             snd, "To PointProcess (periodic, cc)", 75.0, 600.0
         )
@@ -210,8 +304,9 @@ def _compute_jitter_shimmer(audio_bytes: bytes, sr: int) -> tuple[float, float]:
             "Get shimmer (local)",
             0.0, 0.0, 0.0001, 0.02, 1.3, 1.6,
         )
-        jitter = jitter * 100 if jitter else 1.2
-        shimmer = shimmer * 100 if shimmer else 3.5
+        # Praat reports undefined measures (e.g. no voiced periods) as NaN
+        jitter = jitter * 100 if jitter and math.isfinite(jitter) else 1.2
+        shimmer = shimmer * 100 if shimmer and math.isfinite(shimmer) else 3.5
         return (round(jitter, 4), round(shimmer, 4))
     except Exception:
         return _mock_jitter_shimmer()
@@ -232,8 +327,8 @@ def _extract_mock() -> dict:
     stability = max(0.0, min(1.0, 1.0 - pitch_std / mean_pitch))
 
     return {
-        "mfcc_mean": [round(random.uniform(-30, 30), 4) for _ in range(13)],
-        "mfcc_std": [round(random.uniform(1, 15), 4) for _ in range(13)],
+        "mfcc_mean": np.round(np.random.uniform(-30, 30, 13), 4).tolist(),
+        "mfcc_std": np.round(np.random.uniform(1, 15, 13), 4).tolist(),
         "jitter_percent": round(random.uniform(0.8, 2.5), 4),
         "shimmer_percent": round(random.uniform(2.0, 6.0), 4),
         "mean_pitch_hz": round(mean_pitch, 2),
@@ -243,4 +338,5 @@ def _extract_mock() -> dict:
         "speech_rate": round(random.uniform(2.0, 5.5), 2),
         "harmonics_to_noise": round(random.uniform(10, 25), 2),
         "_duration": round(random.uniform(3, 15), 2),
+        "_silent": False,
     }
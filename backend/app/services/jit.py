@@ -0,0 +1,48 @@
+"""
+Optional numba JIT for the DSP and scoring kernels.
+
+numba is imported lazily: importing a module that decorates kernels with
+`njit` never imports numba, so the web process and worker start-up only pay
+for it when a kernel first runs (normally from a warm-up call in the pool
+worker initializer).
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def njit(**options):
+    """
+    Deferred numba.njit.
+
+    The first call of a kernel imports numba, compiles the function and
+    rebinds the defining module's global to the compiled dispatcher, so later
+    calls go straight to machine code.  Without numba the kernel runs as
+    plain Python.
+    """
+    def decorate(func):
+        if not NUMBA_AVAILABLE:
+            return func
+
+        compiled = None
+
+        @functools.wraps(func)
+        def first_call(*args):
+            nonlocal compiled
+            if compiled is None:
+                try:
+                    import numba
+
+                    compiled = numba.njit(**options)(func)
+                except ImportError:
+                    compiled = func
+                func.__globals__[func.__name__] = compiled
+            return compiled(*args)
+
+        return first_call
+
+    return decorate
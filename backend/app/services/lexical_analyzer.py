@@ -1,13 +1,17 @@
 """
 Featherless AI Lexical Cognition Analyzer.
 
-Isolated service module that calls Featherless AI (Llama 3 70B) to evaluate
+Isolated service module that calls Featherless AI (Llama 3 Instruct) to evaluate
 cognitive-linguistic markers from a speech transcript. Returns structured
 scores for vocabulary richness, coherence, word-finding difficulty,
 repetition tendency, and an overall cognitive concern level.
 
 Medical-grade reliability:
-  - Up to 2 automatic retries with exponential backoff
+  - Up to 2 automatic retries with jittered exponential backoff
+    (or the server's Retry-After); 400/401/403/404 are never retried
+  - Optional caller deadline: attempts are capped to the time left, and a
+    retry that would start past it fails immediately
+  - Streams the completion and stops reading once the JSON object closes
   - Never fabricates metrics on failure
   - Raises clean errors for the caller to handle honestly
 """
@@ -15,12 +19,14 @@ Medical-grade reliability:
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
+import random
+import re
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger("cognitive-echo.lexical")
 
@@ -30,37 +36,66 @@ FEATHERLESS_API_URL = "https://api.featherless.ai/v1/chat/completions"
 FEATHERLESS_MODEL = "meta-llama/Meta-Llama-3-8B-Instruct"
 FEATHERLESS_TEMPERATURE = 0.4
 FEATHERLESS_MAX_TOKENS = 300
-REQUEST_TIMEOUT_SECONDS = 60.0
+# Per attempt; kept below the caller's 15 s wall-clock budget
+# (LEXICAL_TIMEOUT_S in risk_engine) so a slow attempt leaves room to retry
+REQUEST_TIMEOUT_SECONDS = 10.0
 MAX_RETRIES = 2
 BASE_BACKOFF_SECONDS = 1.0
+MAX_RETRY_AFTER_SECONDS = 30.0
+_NON_RETRYABLE_STATUS = frozenset({400, 401, 403, 404})
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared client: keeps TCP/TLS connections to Featherless alive across
+# requests and retries. Created lazily, closed from the app lifespan.
+_http_client: httpx.AsyncClient | None = None
 
 # ─── System prompt ────────────────────────────────────────────────────────────
 
 _SYSTEM_PROMPT = (
-    "You are a strict clinical neurolinguistics expert. "
-    "Analyze the following speech transcript for cognitive-linguistic markers. "
-    "Evaluate ONLY the specific linguistic dimensions below based strictly on the source text.\n\n"
-    "CRITICAL: Do NOT default to generic scores like '0.1' or '0.2'. You MUST use the full floating-point scale (0.00 to 1.00) "
-    "to reflect subtle degrees of impairment or fluency accurately.\n\n"
-    "Return a JSON object with exactly these keys:\n"
-    '  "vocabulary_richness"      – float 0.00 to 1.00 (1.00 = highly sophisticated, diverse vocabulary)\n'
-    '  "sentence_coherence"       – float 0.00 to 1.00 (1.00 = perfectly logical, unbroken flow)\n'
-    '  "word_finding_difficulty"  – float 0.00 to 1.00 (1.00 = severe blocking, excessive fillers like "uh", substituting vague words)\n'
-    '  "repetition_tendency"      – float 0.00 to 1.00 (1.00 = highly repetitive loops or echoing)\n'
-    '  "cognitive_concern"        – string, strictly one of "Low", "Medium", or "High" depending on severity.\n'
-    "\n"
-    "Return ONLY valid JSON. No markdown fences, no explanation, no extra text."
+    "You are a clinical neurolinguistics expert. Score the speech transcript for "
+    "cognitive-linguistic markers, using the full 0.00-1.00 range. Return a JSON object with:\n"
+    '"vocabulary_richness": float (1 = diverse, sophisticated)\n'
+    '"sentence_coherence": float (1 = logical, unbroken flow)\n'
+    '"word_finding_difficulty": float (1 = severe blocking, fillers, vague substitutes)\n'
+    '"repetition_tendency": float (1 = highly repetitive)\n'
+    '"cognitive_concern": "Low" | "Medium" | "High"'
 )
 
 _USER_PROMPT_TEMPLATE = "Transcript:\n\n{transcript}"
 
+# Leading ```lang fence / trailing ``` fence around the whole reply (not
+# MULTILINE: fences inside the content are left alone)
+_FENCE_RE = re.compile(r"\A\s*```[a-zA-Z]*[ \t]*\n?|\n?```\s*\Z")
+
 
 # ─── Public API ───────────────────────────────────────────────────────────────
 
-async def analyze_lexical_cognition(transcript: str) -> dict[str, Any]:
+async def analyze_lexical_cognition(
+    transcript: str,
+    *,
+    model: str = FEATHERLESS_MODEL,
+    temperature: float = FEATHERLESS_TEMPERATURE,
+    system_prompt: str = _SYSTEM_PROMPT,
+    deadline: float | None = None,
+) -> dict[str, Any]:
     """
     Analyze cognitive-linguistic markers in a speech transcript using
-    Featherless AI (Llama 3 70B).
+    Featherless AI.
+
+    `model`, `temperature` and `system_prompt` default to the module
+    configuration; override them to run another model variant through the
+    same shared client, retry policy and validation.
+
+    `deadline` is an event-loop time (loop.time()) by which the call must
+    finish.  Each attempt's timeout is capped to the time remaining, and the
+    call raises RuntimeError instead of retrying when the backoff or
+    Retry-After would run past it.
     """
     # ── Input validation ──────────────────────────────────────────────
     if not transcript or not transcript.strip():
@@ -80,11 +115,13 @@ async def analyze_lexical_cognition(transcript: str) -> dict[str, Any]:
 
     # ── Build request payload ─────────────────────────────────────────
     payload: dict[str, Any] = {
-        "model": FEATHERLESS_MODEL,
-        "temperature": FEATHERLESS_TEMPERATURE,
+        "model": model,
+        "temperature": temperature,
         "max_tokens": FEATHERLESS_MAX_TOKENS,
+        "stream": True,
+        "response_format": {"type": "json_object"},
         "messages": [
-            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "system", "content": system_prompt},
             {
                 "role": "user",
                 "content": _USER_PROMPT_TEMPLATE.format(
@@ -100,44 +137,66 @@ async def analyze_lexical_cognition(transcript: str) -> dict[str, Any]:
     }
 
     # ── Call Featherless API (with retry + backoff) ───────────────────
-    logger.info("LLM_CALL_STARTED: Sending transcript (%d chars) to %s", transcript_len, FEATHERLESS_MODEL)
+    logger.info("LLM_CALL_STARTED: Sending transcript (%d chars) to %s", transcript_len, model)
 
     last_error: Exception | None = None
     response = None
+    content = ""
+    loop = asyncio.get_running_loop()
+    body = orjson.dumps(payload)
 
     for attempt in range(1, MAX_RETRIES + 2):  # attempt 1, 2, 3
+        timeout = REQUEST_TIMEOUT_SECONDS
+        if deadline is not None:
+            timeout = min(timeout, deadline - loop.time())
+            if timeout <= 0:
+                _raise_out_of_time(last_error)
         try:
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS)
-            ) as client:
-                response = await client.post(
-                    FEATHERLESS_API_URL,
-                    json=payload,
-                    headers=headers,
-                )
-            
-            # Handle specific auth or bad request errors immediately without retrying
-            if response.status_code in (401, 403):
-                logger.error("LLM_CALL_FAILED: Authentication error (HTTP %d)", response.status_code)
-                raise RuntimeError(f"Invalid or unauthorized Featherless API Key (HTTP {response.status_code})")
-            
-            # Raise exception for other errors (e.g., 500, 429) to trigger retry
-            response.raise_for_status()
-            
+            async with _get_client().stream(
+                "POST",
+                FEATHERLESS_API_URL,
+                content=body,
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                # Handle auth / bad request errors immediately without retrying
+                if response.status_code in (401, 403):
+                    logger.error("LLM_CALL_FAILED: Authentication error (HTTP %d)", response.status_code)
+                    raise RuntimeError(f"Invalid or unauthorized Featherless API Key (HTTP {response.status_code})")
+                if response.status_code in _NON_RETRYABLE_STATUS:
+                    await response.aread()
+                    logger.error("LLM_CALL_FAILED: Request rejected (HTTP %d): %s", response.status_code, response.text[:300])
+                    raise RuntimeError(f"Featherless API rejected the request (HTTP {response.status_code})")
+
+                # Raise exception for other errors (e.g., 500, 429) to trigger retry
+                response.raise_for_status()
+
+                content = await _read_completion(response)
+
             break  # success – exit retry loop
             
         except httpx.TimeoutException as exc:
+            retry_after = None
             last_error = exc
             logger.warning("Featherless API timeout (attempt %d/%d): %s", attempt, MAX_RETRIES + 1, exc)
         except httpx.HTTPStatusError as exc:
+            retry_after = _retry_after_seconds(exc.response)
             last_error = exc
             logger.warning("Featherless API HTTP error %d (attempt %d/%d): %s", exc.response.status_code, attempt, MAX_RETRIES + 1, exc)
         except httpx.RequestError as exc:
+            retry_after = None
             last_error = exc
             logger.warning("Featherless API Request error (attempt %d/%d): %s", attempt, MAX_RETRIES + 1, exc)
 
         if attempt <= MAX_RETRIES:
-            backoff = BASE_BACKOFF_SECONDS * (2 ** (attempt - 1))
+            # Honour the server's Retry-After (429/503); otherwise jittered
+            # exponential backoff so concurrent failures don't retry in lockstep
+            if retry_after is not None:
+                backoff = retry_after
+            else:
+                backoff = BASE_BACKOFF_SECONDS * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            if deadline is not None and loop.time() + backoff >= deadline:
+                _raise_out_of_time(last_error)
             logger.info("Retrying in %.1fs…", backoff)
             await asyncio.sleep(backoff)
     else:
@@ -146,16 +205,6 @@ async def analyze_lexical_cognition(transcript: str) -> dict[str, Any]:
         logger.error("LLM_CALL_FAILED: %s", error_msg)
         raise RuntimeError(error_msg)
 
-    # ── Extract completion text ───────────────────────────────────────
-    try:
-        api_response: dict[str, Any] = response.json()
-        content: str = api_response["choices"][0]["message"]["content"].strip()
-    except (KeyError, IndexError, TypeError, ValueError) as exc:
-        logger.error("LLM_CALL_FAILED: Unexpected API response structure. HTTP %d: %s", response.status_code, exc)
-        if response.text:
-            logger.debug("Raw response: %s", response.text[:500])
-        raise RuntimeError("Featherless API returned an unexpected response format.") from exc
-
     logger.info("LLM_CALL_SUCCESS: Received Featherless response (%d chars). HTTP: %d", len(content), response.status_code)
 
     # ── Parse JSON from LLM output ────────────────────────────────────
@@ -167,27 +216,125 @@ async def analyze_lexical_cognition(transcript: str) -> dict[str, Any]:
     return result
 
 
+async def aclose_http_client() -> None:
+    """Close the shared Featherless HTTP client (call on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 # ─── Internal Helpers ─────────────────────────────────────────────────────────
 
+def _raise_out_of_time(last_error: Exception | None) -> None:
+    """Give up before a retry that could not finish by the caller's deadline."""
+    error_msg = f"Featherless API retry would exceed the time budget. Last error: {last_error}"
+    logger.error("LLM_CALL_FAILED: %s", error_msg)
+    raise RuntimeError(error_msg)
+
+
+async def _read_completion(response: httpx.Response) -> str:
+    """
+    Return the completion text from a chat-completions response.
+
+    Server-sent event streams are read only until the first top-level JSON
+    object in the generated text closes; trailing prose and the rest of the
+    stream are not waited for. A plain JSON body (server ignored `stream`)
+    is parsed whole.
+    """
+    try:
+        if not response.headers.get("content-type", "").startswith("text/event-stream"):
+            api_response: dict[str, Any] = orjson.loads(await response.aread())
+            return api_response["choices"][0]["message"]["content"].strip()
+
+        parts: list[str] = []
+        scanner = _JsonObjectScanner()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            delta = orjson.loads(data)["choices"][0].get("delta") or {}
+            text = delta.get("content") or ""
+            end = scanner.feed(text)
+            if end >= 0:
+                parts.append(text[:end])
+                break
+            parts.append(text)
+        return "".join(parts).strip()
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        logger.error("LLM_CALL_FAILED: Unexpected API response structure. HTTP %d: %s", response.status_code, exc)
+        raise RuntimeError("Featherless API returned an unexpected response format.") from exc
+
+
+class _JsonObjectScanner:
+    """Incremental brace-depth tracker that ignores braces inside JSON strings."""
+
+    __slots__ = ("depth", "in_string", "escaped")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int:
+        """Return the index just past the first top-level object's closing brace, or -1."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{":
+                self.depth += 1
+            elif self.depth:
+                if ch == '"':
+                    self.in_string = True
+                elif ch == "}":
+                    self.depth -= 1
+                    if self.depth == 0:
+                        return i + 1
+        return -1
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse a delta-seconds Retry-After header (capped); None if absent or unparseable."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER_SECONDS)
+    except ValueError:
+        return None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared pooled client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            http2=HTTP2_AVAILABLE,
+        )
+    return _http_client
+
+
 def _parse_llm_json(raw: str) -> dict[str, Any]:
     """
     Attempt to parse JSON from the LLM's raw text output.
 
     Handles common issues like markdown fences wrapping the JSON.
     """
-    # Strip markdown code fences if present
-    cleaned = raw.strip()
-    if cleaned.startswith("```"):
-        # Remove opening fence (with optional language tag)
-        first_newline = cleaned.index("\n") if "\n" in cleaned else 3
-        cleaned = cleaned[first_newline + 1 :]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[: -3]
-    cleaned = cleaned.strip()
+    # Strip markdown code fences (opening fence + language tag, closing fence)
+    cleaned = _FENCE_RE.sub("", raw).strip()
 
     try:
-        parsed = json.loads(cleaned)
-    except json.JSONDecodeError as exc:
+        parsed = orjson.loads(cleaned)
+    except orjson.JSONDecodeError as exc:
         logger.error("Failed to parse LLM JSON output: %s | Raw: %s", exc, raw[:300])
         raise RuntimeError(
             "Featherless AI did not return valid JSON. "
@@ -0,0 +1,136 @@
+"""
+Lexical analysis result cache.
+
+Keeps successful Featherless AI results keyed by a hash of the transcript so
+repeated transcripts skip the LLM round-trip entirely.
+
+Two layers:
+  - In-process LRU (always on when the cache is enabled)
+  - Redis GET/SETEX with a 24 h TTL, shared across uvicorn workers, used
+    only when REDIS_URL is set and the `redis` package is installed
+
+Only successful analyses are ever stored; failures are never cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger("cognitive-echo.lexical-cache")
+
+# ─── Configuration ────────────────────────────────────────────────────────────
+
+LEXICAL_CACHE_ENABLED = os.getenv("LEXICAL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LEXICAL_CACHE_MAXSIZE = 512
+LEXICAL_CACHE_TTL_SECONDS = 24 * 60 * 60
+_REDIS_KEY_PREFIX = "cognitive-echo:lexical:"
+
+try:
+    import redis.asyncio as redis_asyncio
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis_asyncio = None
+    REDIS_AVAILABLE = False
+
+_local_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_redis_client = None
+
+
+# ─── Public API ───────────────────────────────────────────────────────────────
+
+def transcript_key(transcript: str) -> str:
+    """Stable cache key for a transcript (128-bit BLAKE2b of the stripped text)."""
+    return hashlib.blake2b(transcript.strip().encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def get_cached_metrics(key: str) -> dict[str, Any] | None:
+    """Return a copy of the cached metrics for `key`, or None on a miss."""
+    if not LEXICAL_CACHE_ENABLED:
+        return None
+
+    cached = _local_cache.get(key)
+    if cached is not None:
+        _local_cache.move_to_end(key)
+        return dict(cached)
+
+    client = _get_redis()
+    if client is None:
+        return None
+
+    try:
+        raw = await client.get(_REDIS_KEY_PREFIX + key)
+    except Exception as exc:
+        logger.warning("Redis lexical cache read failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+
+    try:
+        metrics = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
+        logger.warning("Redis lexical cache entry is not valid JSON: %s", exc)
+        return None
+    _store_local(key, metrics)
+    return dict(metrics)
+
+
+async def cache_metrics(key: str, metrics: dict[str, Any]) -> None:
+    """Store successful lexical metrics under `key`."""
+    if not LEXICAL_CACHE_ENABLED:
+        return
+
+    _store_local(key, dict(metrics))
+
+    client = _get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.setex(
+            _REDIS_KEY_PREFIX + key,
+            LEXICAL_CACHE_TTL_SECONDS,
+            orjson.dumps(metrics),
+        )
+    except Exception as exc:
+        logger.warning("Redis lexical cache write failed: %s", exc)
+
+
+async def aclose_redis_client() -> None:
+    """Close the shared Redis client, if one was created (call on app shutdown)."""
+    global _redis_client
+    if _redis_client is not None:
+        # redis-py >= 5.0.1 names it aclose(); older 4.x/5.0 releases use close()
+        close = getattr(_redis_client, "aclose", None) or _redis_client.close
+        await close()
+        _redis_client = None
+
+
+# ─── Internal Helpers ─────────────────────────────────────────────────────────
+
+def _store_local(key: str, metrics: dict[str, Any]) -> None:
+    # No await between insert and eviction, so this is atomic on the event loop
+    _local_cache[key] = metrics
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > LEXICAL_CACHE_MAXSIZE:
+        _local_cache.popitem(last=False)
+
+
+def _get_redis():
+    """Lazily create the shared Redis client when REDIS_URL is configured (None on failure)."""
+    global _redis_client
+    if _redis_client is None and REDIS_AVAILABLE:
+        url = os.getenv("REDIS_URL")
+        if url:
+            try:
+                _redis_client = redis_asyncio.from_url(url)
+            except Exception as exc:
+                logger.warning("Redis lexical cache unavailable (bad REDIS_URL?): %s", exc)
+                return None
+    return _redis_client
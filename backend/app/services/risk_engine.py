@@ -11,20 +11,34 @@ Performs:
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+import functools
+import importlib.util
 import logging
 import math
-import random
+import operator
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
 
+from app.services.jit import NUMBA_AVAILABLE, njit
 from app.services.lexical_analyzer import analyze_lexical_cognition
+from app.services.lexical_cache import cache_metrics, get_cached_metrics, transcript_key
 
 logger = logging.getLogger("cognitive-echo.risk")
 
-# ─── ML Model Loading (once at import time) ──────────────────────────────────
+# ─── ML Model Loading (lazy, once per process) ───────────────────────────────
 
+# Nothing is read from disk at import: the first caller of
+# _ensure_model_loaded() (normally warmup_model() in a pool worker's
+# initializer) loads the artifacts under _model_lock, and every later call
+# returns the cached outcome.  Importing risk_engine stays cheap for the web
+# process, which only fuses scores.
 _MODEL_DIR = Path(__file__).resolve().parent.parent / "models"
 
 _ml_model = None
@@ -32,58 +46,269 @@ _ml_scaler = None
 _ml_label_encoder = None
 _ml_feature_names: list[str] = []
 _ml_ready = False
+_model_load_attempted = False
+_model_lock = threading.Lock()
 
-try:
-    import joblib
-
-    _model_path = _MODEL_DIR / "neuro_risk_model.pkl"
-    _scaler_path = _MODEL_DIR / "scaler.pkl"
-    _encoder_path = _MODEL_DIR / "label_encoder.pkl"
-    _features_path = _MODEL_DIR / "feature_names.pkl"
-
-    if _model_path.exists() and _scaler_path.exists():
-        _ml_model = joblib.load(_model_path)
-        _ml_scaler = joblib.load(_scaler_path)
-        if _encoder_path.exists():
-            _ml_label_encoder = joblib.load(_encoder_path)
-        if _features_path.exists():
-            _ml_feature_names = joblib.load(_features_path)
-        _ml_ready = True
-        logger.info(
-            "ML model loaded successfully (%d features, classes=%s)",
-            len(_ml_feature_names),
-            list(_ml_label_encoder.classes_) if _ml_label_encoder else "unknown",
+# neuro_risk_model.onnx is exported by app.ml.train_acoustic_model; when it and
+# onnxruntime are present, predict_proba runs through ORT instead of sklearn.
+_ort_session = None
+_ort_input_name = ""
+_ort_output_names: list[str] = []
+
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+
+def _ensure_model_loaded() -> bool:
+    """Load the ML artifacts on first use; True when the model is ready."""
+    if not _model_load_attempted:
+        with _model_lock:
+            if not _model_load_attempted:
+                _load_model()
+    return _ml_ready
+
+
+def _load_model() -> None:
+    global _ml_model, _ml_scaler, _ml_label_encoder, _ml_feature_names, _ml_ready
+    global _model_load_attempted
+
+    # Labels cached against a previously loaded model/encoder would be stale
+    _class_label.cache_clear()
+    try:
+        import joblib
+
+        bundle_path = _MODEL_DIR / "neuro_risk_bundle.joblib"
+        model_path = _MODEL_DIR / "neuro_risk_model.pkl"
+        scaler_path = _MODEL_DIR / "scaler.pkl"
+        encoder_path = _MODEL_DIR / "label_encoder.pkl"
+        features_path = _MODEL_DIR / "feature_names.pkl"
+
+        if bundle_path.exists():
+            # One uncompressed file, memory-mapped: numpy buffers stay in the
+            # page cache and are shared by every worker process
+            bundle = joblib.load(bundle_path, mmap_mode="r")
+            _ml_model = bundle["model"]
+            _ml_scaler = bundle["scaler"]
+            _ml_label_encoder = bundle.get("label_encoder")
+            _ml_feature_names = list(bundle.get("feature_names") or [])
+            _ml_ready = True
+        elif model_path.exists() and scaler_path.exists():
+            _ml_model = joblib.load(model_path)
+            _ml_scaler = joblib.load(scaler_path)
+            if encoder_path.exists():
+                _ml_label_encoder = joblib.load(encoder_path)
+            if features_path.exists():
+                _ml_feature_names = joblib.load(features_path)
+            _ml_ready = True
+
+        if _ml_ready:
+            logger.info(
+                "ML model loaded successfully (%d features, classes=%s)",
+                len(_ml_feature_names),
+                list(_ml_label_encoder.classes_) if _ml_label_encoder else "unknown",
+            )
+            _load_onnx_session()
+        else:
+            logger.warning(
+                "ML model files not found in %s – using heuristic scoring.", _MODEL_DIR
+            )
+    except Exception as exc:
+        _ml_ready = False
+        logger.warning("Failed to load ML model – falling back to heuristic: %s", exc)
+    finally:
+        # Set last so lock-free readers never see a half-loaded model
+        _model_load_attempted = True
+
+
+def _load_onnx_session() -> None:
+    global _ort_session, _ort_input_name, _ort_output_names
+
+    onnx_path = _MODEL_DIR / "neuro_risk_model.onnx"
+    if not (ONNXRUNTIME_AVAILABLE and onnx_path.exists()):
+        return
+    try:
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        # Requests already fan out across the process pool, one worker per core
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
         )
-    else:
-        logger.warning(
-            "ML model files not found in %s – using heuristic scoring.", _MODEL_DIR
+        _ort_input_name = session.get_inputs()[0].name
+        _ort_output_names = [session.get_outputs()[-1].name]
+        _ort_session = session
+        logger.info("ONNX Runtime session loaded (%s)", onnx_path.name)
+    except Exception as exc:
+        _ort_session = None
+        logger.warning("Failed to load ONNX model – using sklearn inference: %s", exc)
+
+
+def ml_model_ready() -> bool:
+    """Whether the ML model is loaded in this process (loads it if needed)."""
+    return _ensure_model_loaded()
+
+
+# ─── Scoring Weights ─────────────────────────────────────────────────────────
+
+# Vocal Twin deviation: [mfcc_drift, pitch_deviation, rhythm_deviation]
+_BASELINE_WEIGHTS = (0.40, 0.30, 0.30)
+# Acoustic heuristic: [jitter, shimmer, stability, hnr, baseline_deviation]
+_ACOUSTIC_WEIGHTS = np.array([0.20, 0.15, 0.20, 0.15, 0.30])
+# ML / heuristic acoustic blend
+_ML_BLEND_WEIGHTS = (0.40, 0.60)
+# Placeholder lexical risk: [1-coherence, 1-vocabulary, repetition]
+_LEXICAL_RISK_WEIGHTS = (0.40, 0.30, 0.30)
+# Placeholder cognitive risk: [acoustic, lexical, baseline_deviation]
+_COGNITIVE_RISK_WEIGHTS = (0.55, 0.30, 0.15)
+# Featherless cognitive health: [vocabulary, coherence, 1-word_finding, 1-repetition]
+_COGNITIVE_WEIGHTS = (0.25, 0.25, 0.25, 0.25)
+# Final neuro risk fusion: [acoustic, cognitive]
+_FUSION_WEIGHTS = (0.60, 0.40)
+
+# Risk level bands: [0, 30) Low, [30, 60) Medium, [60, 100] High
+_LEVEL_THRESHOLDS = (30.0, 60.0)
+_LEVELS = ("Low", "Medium", "High")
+
+# Deterministic confidence curve, indexed by score in 0.1 steps (0.0–100.0):
+# peak confidence at 50, falling 0.005 per point; lower without cognitive data
+_CONF_CURVE_AVAIL = tuple(0.85 - abs(i / 10.0 - 50.0) * 0.005 for i in range(1001))
+_CONF_CURVE_NOAVAIL = tuple(0.65 - abs(i / 10.0 - 50.0) * 0.005 for i in range(1001))
+
+# ML probability → risk score is the sigmoid 100/(1+e^(-6(p-0.5))), rounded
+# half-up to 0.1.  Inverting it gives the probability at which the rounded
+# score steps from k/10 to (k+1)/10, so a bisect replaces exp + round.
+_ML_RISK_THRESHOLDS = np.array(
+    [0.5 - math.log(1000.0 / (k + 0.5) - 1.0) / 6.0 for k in range(1000)]
+)
+_ML_RISK_THRESHOLDS_LIST = _ML_RISK_THRESHOLDS.tolist()
+
+# ─── Simulated Noise ─────────────────────────────────────────────────────────
+
+# Demo jitter is drawn from a PCG64 generator in blocks and served one value
+# at a time.  Generator and buffers live in the thread-local _noise (see
+# _Noise below), so threads never share a draw or a buffer position; each
+# spawned pool worker seeds its own generators.
+_RNG_BUFFER_SIZE = 1024
+
+# Baseline drift noise [mfcc, pitch, rhythm] comes pre-shaped as rows, one
+# row per comparison, so compare_to_baseline makes a single draw
+_BASELINE_NOISE_LOW = (-5.0, -3.0, -4.0)
+_BASELINE_NOISE_HIGH = (5.0, 3.0, 4.0)
+
+
+# ─── Feature Input ───────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class ScoringInputs:
+    """
+    The scalar acoustic features the scoring functions read, with the
+    defaults used when the extractor did not report a value.
+
+    Built once per recording from the extractor's feature dict (at the
+    scoring boundary in main) so the baseline, heuristic and model paths
+    read slots instead of repeating dict.get.
+    """
+
+    jitter_percent: float = 1.5
+    shimmer_percent: float = 4.0
+    mean_pitch_hz: float = 150.0
+    pitch_std_hz: float = 10.0
+    pitch_stability: float = 0.8
+    pause_ratio: float = 0.15
+    harmonics_to_noise: float = 20.0
+    speech_rate: float = 3.5
+
+    @classmethod
+    def from_dict(cls, features: dict) -> ScoringInputs:
+        get = features.get
+        return cls(
+            get("jitter_percent", 1.5),
+            get("shimmer_percent", 4.0),
+            get("mean_pitch_hz", 150.0),
+            get("pitch_std_hz", 10.0),
+            get("pitch_stability", 0.8),
+            get("pause_ratio", 0.15),
+            get("harmonics_to_noise", 20.0),
+            get("speech_rate", 3.5),
         )
-except Exception as exc:
-    logger.warning("Failed to load ML model – falling back to heuristic: %s", exc)
+
+
+def _as_inputs(features: ScoringInputs | dict) -> ScoringInputs:
+    """Accept either form; dicts are converted, ScoringInputs pass through."""
+    return features if type(features) is ScoringInputs else ScoringInputs.from_dict(features)
+
+
+# ─── Result Types ────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class BaselineReport:
+    """Vocal Twin comparison for one recording (BaselineComparison fields)."""
+
+    deviation_score: float
+    mfcc_drift: float
+    pitch_deviation: float
+    rhythm_deviation: float
+    status: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "deviation_score": self.deviation_score,
+            "mfcc_drift": self.mfcc_drift,
+            "pitch_deviation": self.pitch_deviation,
+            "rhythm_deviation": self.rhythm_deviation,
+            "status": self.status,
+        }
+
+
+@dataclass(slots=True)
+class RiskReport:
+    """Scored risk indicators (RiskScores fields)."""
+
+    acoustic_risk_score: float
+    cognitive_risk_score: float | None
+    neuro_risk_level: str
+    confidence: float
+    cognitive_available: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "acoustic_risk_score": self.acoustic_risk_score,
+            "cognitive_risk_score": self.cognitive_risk_score,
+            "neuro_risk_level": self.neuro_risk_level,
+            "confidence": self.confidence,
+            "cognitive_available": self.cognitive_available,
+        }
 
 
 # ─── Baseline Comparison (Vocal Twin) ────────────────────────────────────────
 
-def compare_to_baseline(features: dict) -> dict:
+def compare_to_baseline(features: ScoringInputs | dict) -> BaselineReport:
     """
     Compare current voice features against a stored baseline profile.
 
     In production this would load a per-user baseline vector and compute
     cosine distance.  For the demo we simulate realistic drift values.
     """
-    jitter = features.get("jitter_percent", 1.5)
-    shimmer = features.get("shimmer_percent", 4.0)
-    stability = features.get("pitch_stability", 0.8)
-    pause = features.get("pause_ratio", 0.15)
+    v = _as_inputs(features)
+    mfcc_base, pitch_base, rhythm_base = _compare_to_baseline_core(
+        # Raw extractor values may be negative or non-finite, so these use
+        # round() rather than _q2
+        round(v.jitter_percent, 2),
+        round(v.shimmer_percent, 2),
+        round(v.pause_ratio, 2),
+        round(v.pitch_std_hz, 2),
+    )
+    w_mfcc, w_pitch, w_rhythm = _BASELINE_WEIGHTS
+    mfcc_noise, pitch_noise, rhythm_noise = _baseline_noise()
 
     # Simulate MFCC vector drift (Euclidean dist normalised to 0-100)
-    mfcc_drift = _clamp(abs(jitter - 1.2) * 15 + abs(shimmer - 3.5) * 5 + random.uniform(-5, 5))
+    mfcc_drift = _clamp(mfcc_base + mfcc_noise)
 
-    pitch_deviation = _clamp(abs(features.get("pitch_std_hz", 10) - 12) * 3 + random.uniform(-3, 3))
-    rhythm_deviation = _clamp(abs(pause - 0.12) * 120 + random.uniform(-4, 4))
+    pitch_deviation = _clamp(pitch_base + pitch_noise)
+    rhythm_deviation = _clamp(rhythm_base + rhythm_noise)
 
-    deviation = round((mfcc_drift * 0.4 + pitch_deviation * 0.3 + rhythm_deviation * 0.3), 2)
-    deviation = _clamp(deviation)
+    deviation = _q2(_clamp(mfcc_drift * w_mfcc + pitch_deviation * w_pitch + rhythm_deviation * w_rhythm))
 
     status = (
         "normal" if deviation < 20
@@ -92,18 +317,38 @@ def compare_to_baseline(features: dict) -> dict:
         else "critical_drift"
     )
 
-    return {
-        "deviation_score": round(deviation, 2),
-        "mfcc_drift": round(mfcc_drift, 2),
-        "pitch_deviation": round(pitch_deviation, 2),
-        "rhythm_deviation": round(rhythm_deviation, 2),
-        "status": status,
-    }
+    return BaselineReport(
+        deviation_score=deviation,
+        mfcc_drift=_q2(mfcc_drift),
+        pitch_deviation=_q2(pitch_deviation),
+        rhythm_deviation=_q2(rhythm_deviation),
+        status=status,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _compare_to_baseline_core(
+    jitter: float,
+    shimmer: float,
+    pause: float,
+    pitch_std: float,
+) -> tuple[float, float, float]:
+    """
+    Deterministic (pre-noise) MFCC / pitch / rhythm deviations.
+
+    Inputs are quantized to 2 decimals by the caller so repeat recordings
+    of the same voice hit the cache.
+    """
+    return (
+        abs(jitter - 1.2) * 15 + abs(shimmer - 3.5) * 5,
+        abs(pitch_std - 12) * 3,
+        abs(pause - 0.12) * 120,
+    )
 
 
 # ─── ML-Based Acoustic Risk ──────────────────────────────────────────────────
 
-def build_model_feature_vector(features: dict) -> np.ndarray:
+def build_model_feature_vector(features: ScoringInputs | dict) -> np.ndarray:
     """
     Map live-extracted acoustic features to the model's expected 28-feature input.
 
@@ -125,60 +370,101 @@ def build_model_feature_vector(features: dict) -> np.ndarray:
         f25–f26: Voice breaks
         f27: UPDRS motor score   →  global mean (13.0)
     """
-    jitter = features.get("jitter_percent", 1.5)
-    shimmer = features.get("shimmer_percent", 4.0)
-    pitch_mean = features.get("mean_pitch_hz", 150.0)
-    pitch_std = features.get("pitch_std_hz", 10.0)
-    stability = features.get("pitch_stability", 0.8)
-    pause = features.get("pause_ratio", 0.15)
-    hnr = features.get("harmonics_to_noise", 20.0)
-    speech_rate = features.get("speech_rate", 3.5)
-
-    # Derived values
-    jitter_abs = jitter / 100.0 * (1.0 / max(pitch_mean, 1.0))
-    period_mean = 1.0 / max(pitch_mean, 1.0)
-    period_std = pitch_std / max(pitch_mean ** 2, 1.0)
-    n_pulses = max(10, int(speech_rate * 30))
-    pitch_min = max(50.0, pitch_mean - 2 * pitch_std)
-    pitch_max = pitch_mean + 2 * pitch_std
-
-    # Shimmer in this dataset is much larger scale (~13 mean)
-    shimmer_scaled = shimmer * 3.0
-
-    vec = np.array([
-        20.5,                                    # f0:  Subject ID (global mean)
-        jitter,                                  # f1:  Jitter(%)
-        jitter_abs,                              # f2:  Jitter(Abs)
-        jitter * 0.5,                            # f3:  Jitter:RAP
-        jitter * 0.5,                            # f4:  Jitter:PPQ5
-        jitter * 1.4,                            # f5:  Jitter:DDP
-        shimmer_scaled,                          # f6:  Shimmer
-        shimmer * 0.30,                          # f7:  Shimmer(dB)
-        shimmer_scaled * 0.44,                   # f8:  Shimmer:APQ3
-        shimmer_scaled * 0.62,                   # f9:  Shimmer:APQ5
-        shimmer_scaled * 0.95,                   # f10: Shimmer:APQ11
-        shimmer_scaled * 1.32,                   # f11: Shimmer:DDA
-        stability,                               # f12: AC (autocorrelation)
-        max(0.01, 1.0 / (hnr + 0.01)),          # f13: NTH
-        hnr,                                     # f14: HTN (harmonics-to-noise)
-        pitch_mean,                              # f15: Median pitch
-        pitch_mean,                              # f16: Mean pitch
-        pitch_std,                               # f17: StdDev pitch
-        pitch_min,                               # f18: Min pitch
-        pitch_max,                               # f19: Max pitch
-        float(n_pulses),                         # f20: Number of pulses
-        float(max(1, n_pulses - 4)),             # f21: Number of periods
-        period_mean,                             # f22: Mean period
-        period_std,                              # f23: StdDev period
-        pause * 100.0,                           # f24: Fraction unvoiced (%)
-        max(0.0, (pause - 0.1) * 10),           # f25: Number of voice breaks
-        max(0.0, (pause - 0.1) * 80),           # f26: Degree of voice breaks
-        13.0,                                    # f27: UPDRS (global mean)
-    ], dtype=np.float64)
-
-    # Safety: replace NaN / Inf with 0
-    vec = np.nan_to_num(vec, nan=0.0, posinf=0.0, neginf=0.0)
-    return vec
+    return build_model_feature_matrix([features])[0]
+
+
+
+def build_model_feature_matrix(features_list: Sequence[ScoringInputs | dict]) -> np.ndarray:
+    """
+    (N, 28) model input for N recordings, one build_model_feature_vector
+    row per recording, filled by a single kernel call.
+    """
+    raw = np.array(
+        [
+            (
+                v.jitter_percent,
+                v.shimmer_percent,
+                v.mean_pitch_hz,
+                v.pitch_std_hz,
+                v.pitch_stability,
+                v.pause_ratio,
+                v.harmonics_to_noise,
+                v.speech_rate,
+            )
+            for v in map(_as_inputs, features_list)
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 8)
+    X = np.empty((raw.shape[0], 28), dtype=np.float64)
+    _feature_matrix_kernel(raw, X)
+    return X
+
+
+@njit(cache=True)
+def _feature_matrix_kernel(raw: np.ndarray, out: np.ndarray) -> None:
+    """
+    Fill `out` (N, 28) from `raw` (N, 8) rows of ScoringInputs fields in
+    declaration order; NaN / Inf become 0.
+
+    No fastmath here: it would let LLVM assume finite inputs and drop the
+    isfinite guard.
+    """
+    for r in range(raw.shape[0]):
+        jitter = raw[r, 0]
+        shimmer = raw[r, 1]
+        pitch_mean = raw[r, 2]
+        pitch_std = raw[r, 3]
+        stability = raw[r, 4]
+        pause = raw[r, 5]
+        hnr = raw[r, 6]
+        speech_rate = raw[r, 7]
+        row = out[r]
+
+        # Derived values
+        jitter_abs = jitter / 100.0 * (1.0 / max(pitch_mean, 1.0))
+        period_mean = 1.0 / max(pitch_mean, 1.0)
+        period_std = pitch_std / max(pitch_mean ** 2, 1.0)
+        pulses = speech_rate * 30.0
+        n_pulses = max(10.0, math.floor(pulses)) if math.isfinite(pulses) else 10.0
+        pitch_min = max(50.0, pitch_mean - 2 * pitch_std)
+        pitch_max = pitch_mean + 2 * pitch_std
+
+        # Shimmer in this dataset is much larger scale (~13 mean)
+        shimmer_scaled = shimmer * 3.0
+
+        row[0] = 20.5                                # f0:  Subject ID (global mean)
+        row[1] = jitter                              # f1:  Jitter(%)
+        row[2] = jitter_abs                          # f2:  Jitter(Abs)
+        row[3] = jitter * 0.5                        # f3:  Jitter:RAP
+        row[4] = jitter * 0.5                        # f4:  Jitter:PPQ5
+        row[5] = jitter * 1.4                        # f5:  Jitter:DDP
+        row[6] = shimmer_scaled                      # f6:  Shimmer
+        row[7] = shimmer * 0.30                      # f7:  Shimmer(dB)
+        row[8] = shimmer_scaled * 0.44               # f8:  Shimmer:APQ3
+        row[9] = shimmer_scaled * 0.62               # f9:  Shimmer:APQ5
+        row[10] = shimmer_scaled * 0.95              # f10: Shimmer:APQ11
+        row[11] = shimmer_scaled * 1.32              # f11: Shimmer:DDA
+        row[12] = stability                          # f12: AC (autocorrelation)
+        row[13] = max(0.01, 1.0 / (hnr + 0.01))      # f13: NTH
+        row[14] = hnr                                # f14: HTN (harmonics-to-noise)
+        row[15] = pitch_mean                         # f15: Median pitch
+        row[16] = pitch_mean                         # f16: Mean pitch
+        row[17] = pitch_std                          # f17: StdDev pitch
+        row[18] = pitch_min                          # f18: Min pitch
+        row[19] = pitch_max                          # f19: Max pitch
+        row[20] = n_pulses                           # f20: Number of pulses
+        row[21] = max(1.0, n_pulses - 4.0)           # f21: Number of periods
+        row[22] = period_mean                        # f22: Mean period
+        row[23] = period_std                         # f23: StdDev period
+        row[24] = pause * 100.0                      # f24: Fraction unvoiced (%)
+        row[25] = max(0.0, (pause - 0.1) * 10)       # f25: Number of voice breaks
+        row[26] = max(0.0, (pause - 0.1) * 80)       # f26: Degree of voice breaks
+        row[27] = 13.0                               # f27: UPDRS (global mean)
+
+        # Safety: replace NaN / Inf with 0
+        for i in range(28):
+            if not math.isfinite(row[i]):
+                row[i] = 0.0
 
 
 def predict_acoustic_risk(feature_vector: list[float] | np.ndarray) -> tuple[str, float]:
@@ -191,10 +477,30 @@ def predict_acoustic_risk(feature_vector: list[float] | np.ndarray) -> tuple[str
 
     Raises RuntimeError if the model is not loaded.
     """
-    if not _ml_ready or _ml_model is None:
+    [(label, confidence)] = predict_acoustic_risk_batch([feature_vector])
+
+    logger.info(
+        "ML prediction: label=%s, confidence=%.3f, vector_len=%d",
+        label, confidence, len(feature_vector),
+    )
+    return label, confidence
+
+
+def predict_acoustic_risk_batch(
+    feature_vectors: Sequence[list[float] | np.ndarray],
+) -> list[tuple[str, float]]:
+    """
+    Run ML inference on many feature vectors with a single predict_proba call.
+
+    Returns one (predicted_label, confidence) pair per vector; the label is
+    the argmax class, exactly what `predict` would return.
+
+    Raises RuntimeError if the model is not loaded.
+    """
+    if not _ensure_model_loaded() or _ml_model is None:
         raise RuntimeError("ML model not loaded.")
 
-    X = np.asarray(feature_vector, dtype=np.float64).reshape(1, -1)
+    X = np.stack([np.asarray(v, dtype=np.float64) for v in feature_vectors])
 
     expected = len(_ml_feature_names) if _ml_feature_names else X.shape[1]
     if X.shape[1] != expected:
@@ -202,25 +508,37 @@ def predict_acoustic_risk(feature_vector: list[float] | np.ndarray) -> tuple[str
             f"Feature length mismatch: got {X.shape[1]}, expected {expected}"
         )
 
-    # Safety: replace NaN / Inf
-    X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+    # Safety: replace NaN / Inf (in place on the stacked copy; usually a no-op)
+    if not np.isfinite(X).all():
+        np.nan_to_num(X, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
 
-    # Predict
-    pred_encoded = _ml_model.predict(X)[0]
-    proba = _ml_model.predict_proba(X)[0]
-    confidence = float(np.max(proba))
+    proba = _predict_proba(X)
+    best = np.argmax(proba, axis=1)
+    confidences = proba[np.arange(len(best)), best].tolist()
+    labels = [_class_label(i) for i in best.tolist()]
+    return list(zip(labels, confidences))
 
-    # Decode label
-    if _ml_label_encoder is not None:
-        label = str(_ml_label_encoder.inverse_transform([pred_encoded])[0])
-    else:
-        label = str(pred_encoded)
 
-    logger.info(
-        "ML prediction: label=%s, confidence=%.3f, vector_len=%d",
-        label, confidence, X.shape[1],
-    )
-    return label, confidence
+def _predict_proba(X: np.ndarray) -> np.ndarray:
+    """(N, n_classes) probabilities via ONNX Runtime when loaded, sklearn otherwise."""
+    if _ort_session is not None:
+        return _ort_session.run(_ort_output_names, {_ort_input_name: X})[0]
+    return _ml_model.predict_proba(X)
+
+
+@functools.lru_cache(maxsize=None)
+def _class_label(class_index: int) -> str:
+    """
+    Original label string for column `class_index` of predict_proba.
+
+    Cached: there are only n_classes inputs and LabelEncoder.inverse_transform
+    costs ~0.1 ms per call in input validation alone.  The cache reads the
+    model globals, so _load_model clears it before (re)loading them.
+    """
+    encoded = _ml_model.classes_[[class_index]]
+    if _ml_label_encoder is not None:
+        return str(_ml_label_encoder.inverse_transform(encoded)[0])
+    return str(encoded[0])
 
 
 def _probability_to_risk(proba_at_risk: float) -> float:
@@ -232,15 +550,18 @@ def _probability_to_risk(proba_at_risk: float) -> float:
       prob ~ 0.5  → moderate  (35–50)
       prob > 0.7  → high risk (60–95)
     """
-    # Sigmoid stretch centred at 0.5
-    x = (proba_at_risk - 0.5) * 6.0
-    score = 100.0 / (1.0 + math.exp(-x))
-    return round(_clamp(score), 1)
+    # Sigmoid stretch centred at 0.5, looked up via _ML_RISK_THRESHOLDS
+    return bisect.bisect_right(_ML_RISK_THRESHOLDS_LIST, proba_at_risk) / 10.0
+
+
+def _probability_to_risk_batch(proba_at_risk: np.ndarray) -> np.ndarray:
+    """Vectorized _probability_to_risk: one searchsorted over the whole batch."""
+    return np.searchsorted(_ML_RISK_THRESHOLDS, proba_at_risk, side="right") / 10.0
 
 
 # ─── Acoustic Risk Score ─────────────────────────────────────────────────────
 
-def compute_acoustic_risk(features: dict, baseline: dict) -> float:
+def compute_acoustic_risk(features: ScoringInputs | dict, baseline: BaselineReport) -> float:
     """
     Compute acoustic risk score (0–100).
 
@@ -250,23 +571,19 @@ def compute_acoustic_risk(features: dict, baseline: dict) -> float:
       3. Final score = weighted blend (40% ML + 60% heuristic).
       4. On ML failure, use heuristic only.
     """
+    features = _as_inputs(features)
     heuristic_score = _heuristic_acoustic_risk(features, baseline)
 
     # ── Attempt ML blend ──────────────────────────────────────────────
-    if _ml_ready:
+    if _ensure_model_loaded():
         try:
-            vec = build_model_feature_vector(features)
-            X = np.asarray(vec, dtype=np.float64).reshape(1, -1)
-            X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+            # Already float64 with non-finite entries zeroed by the kernel
+            X = build_model_feature_vector(features).reshape(1, -1)
 
-            proba = _ml_model.predict_proba(X)[0]
-            pred_encoded = _ml_model.predict(X)[0]
+            proba = _predict_proba(X)[0]
 
-            # Decode label for logging
-            if _ml_label_encoder is not None:
-                label = str(_ml_label_encoder.inverse_transform([pred_encoded])[0])
-            else:
-                label = str(pred_encoded)
+            # Decode the argmax class for logging (what `predict` returns)
+            label = _class_label(int(np.argmax(proba)))
 
             # At-risk class probability (class "1" / "parkinson")
             at_risk_idx = 1 if len(proba) > 1 else 0
@@ -274,7 +591,8 @@ def compute_acoustic_risk(features: dict, baseline: dict) -> float:
             ml_score = _probability_to_risk(prob_at_risk)
 
             # Blend: 40% ML + 60% heuristic
-            blended = round(_clamp(ml_score * 0.40 + heuristic_score * 0.60), 1)
+            w_ml, w_heuristic = _ML_BLEND_WEIGHTS
+            blended = _q1(_clamp(ml_score * w_ml + heuristic_score * w_heuristic))
 
             logger.info(
                 "Acoustic risk: ML=%.1f (label=%s, prob=%.3f) | "
@@ -293,31 +611,141 @@ def compute_acoustic_risk(features: dict, baseline: dict) -> float:
     return heuristic_score
 
 
-def _heuristic_acoustic_risk(features: dict, baseline: dict) -> float:
+def compute_acoustic_risk_batch(
+    features_list: Sequence[ScoringInputs | dict],
+    baselines: Sequence[BaselineReport],
+) -> np.ndarray:
+    """
+    Score N recordings in one vectorized pass (cohort / batch uploads).
+
+    Same strategy as compute_acoustic_risk — 40% ML + 60% heuristic, or
+    heuristic only when the model is unavailable — but with one
+    predict_proba call for the whole batch.  Returns an (N,) float64 array.
+    """
+    features_list = [_as_inputs(f) for f in features_list]
+    heuristic = _heuristic_acoustic_risk_batch(_acoustic_matrix(features_list, baselines))
+    if len(heuristic) == 0 or not _ensure_model_loaded():
+        return heuristic
+
+    try:
+        X = build_model_feature_matrix(features_list)
+        proba = _predict_proba(X)
+        prob_at_risk = proba[:, 1 if proba.shape[1] > 1 else 0]
+        ml_scores = _probability_to_risk_batch(prob_at_risk)
+        w_ml, w_heuristic = _ML_BLEND_WEIGHTS
+        blended = np.clip(ml_scores * w_ml + heuristic * w_heuristic, 0.0, 100.0)
+        return _q1_batch(blended)
+    except Exception as exc:
+        logger.warning("Batch ML inference failed – using heuristic only: %s", exc)
+        return heuristic
+
+
+def _heuristic_acoustic_risk(features: ScoringInputs | dict, baseline: BaselineReport) -> float:
     """
     Original weighted heuristic scoring (used as fallback).
 
     Returns 0-100 where higher = higher risk.
     """
-    jitter_score = _sigmoid_risk(features.get("jitter_percent", 1.5), center=2.0, steepness=3.0)
-    shimmer_score = _sigmoid_risk(features.get("shimmer_percent", 4.0), center=5.0, steepness=2.0)
-    stability_risk = (1.0 - features.get("pitch_stability", 0.8)) * 100
-    hnr_risk = max(0, 100 - features.get("harmonics_to_noise", 20) * 4)
-    baseline_risk = baseline.get("deviation_score", 25)
-
-    risk = (
-        jitter_score * 0.20
-        + shimmer_score * 0.15
-        + stability_risk * 0.20
-        + hnr_risk * 0.15
-        + baseline_risk * 0.30
-    )
+    risk = float(_heuristic_acoustic_risk_batch(_acoustic_matrix([features], [baseline]))[0])
     logger.info("Acoustic risk (heuristic fallback): %.1f", risk)
-    return round(_clamp(risk), 1)
+    return risk
+
+
+def _heuristic_acoustic_risk_batch(X: np.ndarray) -> np.ndarray:
+    """
+    Vectorized heuristic over an (N, 5) matrix of
+    [jitter, shimmer, stability, hnr, baseline_deviation] rows.
+
+    Runs the numba kernel when available, NumPy otherwise.  Both paths
+    compute in float64 with the same operation order (weighted terms summed
+    left to right), so they agree bit for bit before the final rounding.
+    """
+    if NUMBA_AVAILABLE:
+        risk = np.empty(X.shape[0], dtype=np.float64)
+        _risk_kernel(X, risk)
+        return _q1_batch(risk)
+
+    # One contiguous row per component plus a temp row, reused across calls
+    parts = _scratch.get(6, X.shape[0])
+    tmp = parts[5]
+    _sigmoid_risk(X[:, 0], 2.0, 3.0, out=parts[0], tmp=tmp)
+    _sigmoid_risk(X[:, 1], 5.0, 2.0, out=parts[1], tmp=tmp)
+    np.subtract(1.0, X[:, 2], out=parts[2])
+    parts[2] *= 100.0
+    np.multiply(X[:, 3], -4.0, out=parts[3])
+    parts[3] += 100.0
+    np.maximum(parts[3], 0.0, out=parts[3])
+    np.copyto(parts[4], X[:, 4])
+    # Sequential weighted sum (not a BLAS dot) to match the kernel's order
+    risk = parts[0] * _ACOUSTIC_WEIGHTS[0]
+    for k in range(1, 5):
+        np.multiply(parts[k], _ACOUSTIC_WEIGHTS[k], out=tmp)
+        risk += tmp
+    np.clip(risk, 0.0, 100.0, out=risk)
+    return _q1_batch(risk)
+
+
+@njit(cache=True)
+def _risk_kernel(X: np.ndarray, out: np.ndarray) -> None:
+    """
+    Row-wise heuristic: same formula as the NumPy path, unrounded.
+
+    Single-threaded on purpose — requests already fan out across the
+    process pool, one worker per core.  No fastmath: reassociating the sum
+    would let results drift from the NumPy path at rounding boundaries.
+    """
+    w = _ACOUSTIC_WEIGHTS
+    for i in range(X.shape[0]):
+        x0 = min(8.0, max(-8.0, (X[i, 0] - 2.0) * 3.0))
+        x1 = min(8.0, max(-8.0, (X[i, 1] - 5.0) * 2.0))
+        risk = (
+            50.0 * (1.0 + x0 / (1.0 + abs(x0))) * w[0]
+            + 50.0 * (1.0 + x1 / (1.0 + abs(x1))) * w[1]
+            + (1.0 - X[i, 2]) * 100.0 * w[2]
+            + max(0.0, 100.0 - X[i, 3] * 4.0) * w[3]
+            + X[i, 4] * w[4]
+        )
+        out[i] = min(100.0, max(0.0, risk))
+
+
+def _acoustic_matrix(
+    features_list: Sequence[ScoringInputs | dict],
+    baselines: Sequence[BaselineReport],
+) -> np.ndarray:
+    """Pack features and baseline reports into the (N, 5) float64 heuristic input matrix."""
+    return np.array(
+        [
+            (
+                v.jitter_percent,
+                v.shimmer_percent,
+                v.pitch_stability,
+                v.harmonics_to_noise,
+                b.deviation_score,
+            )
+            for v, b in zip(map(_as_inputs, features_list), baselines)
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 5)
 
 
 # ─── Placeholder Lexical Analysis ────────────────────────────────────────────
 
+# Draw ranges for [coherence, vocabulary, repetition]
+_PLACEHOLDER_LOW = (55.0, 50.0, 5.0)
+_PLACEHOLDER_HIGH = (95.0, 90.0, 40.0)
+
+_SUMMARIES: tuple[str, ...] = (
+    "Speech patterns show generally coherent sentence structure with occasional hesitation markers. "
+    "Vocabulary usage is within normal range. No significant lexical anomalies detected.",
+    "Mild increase in filler words and self-corrections observed. Semantic content remains "
+    "largely coherent. Vocabulary diversity is adequate for conversational speech.",
+    "Speech demonstrates good narrative flow with clear topic maintenance. Minor word-finding "
+    "pauses noted but within age-appropriate norms.",
+    "Analysis reveals consistent use of complex sentence structures. Slight increase in "
+    "repetitive phrasing detected, possibly due to emphasis rather than pathology.",
+)
+
+
 def lexical_analysis_placeholder() -> dict:
     """
     Placeholder for LLM-based lexical analysis (Featherless / Whisper).
@@ -326,26 +754,15 @@ def lexical_analysis_placeholder() -> dict:
       1. Transcribe audio with Whisper
       2. Send transcript to LLM for coherence / vocabulary analysis
     """
-    coherence = round(random.uniform(55, 95), 1)
-    vocabulary = round(random.uniform(50, 90), 1)
-    repetition = round(random.uniform(5, 40), 1)
-
-    summaries = [
-        "Speech patterns show generally coherent sentence structure with occasional hesitation markers. "
-        "Vocabulary usage is within normal range. No significant lexical anomalies detected.",
-        "Mild increase in filler words and self-corrections observed. Semantic content remains "
-        "largely coherent. Vocabulary diversity is adequate for conversational speech.",
-        "Speech demonstrates good narrative flow with clear topic maintenance. Minor word-finding "
-        "pauses noted but within age-appropriate norms.",
-        "Analysis reveals consistent use of complex sentence structures. Slight increase in "
-        "repetitive phrasing detected, possibly due to emphasis rather than pathology.",
-    ]
+    coherence, vocabulary, repetition = np.round(
+        _noise.rng.uniform(_PLACEHOLDER_LOW, _PLACEHOLDER_HIGH), 1
+    ).tolist()
 
     return {
         "coherence_score": coherence,
         "vocabulary_richness": vocabulary,
         "repetition_index": repetition,
-        "summary": random.choice(summaries),
+        "summary": _SUMMARIES[_noise.rng.integers(len(_SUMMARIES))],
     }
 
 
@@ -354,52 +771,86 @@ def lexical_analysis_placeholder() -> dict:
 def compute_cognitive_risk(
     acoustic_risk: float,
     lexical: dict,
-    baseline: dict,
-) -> dict:
+    baseline: BaselineReport,
+) -> RiskReport:
     """
     Aggregate all signals into a final Cognitive Risk Score + level.
     """
-    lex_risk = (
-        (100 - lexical.get("coherence_score", 75)) * 0.4
-        + (100 - lexical.get("vocabulary_richness", 70)) * 0.3
-        + lexical.get("repetition_index", 20) * 0.3
-    )
+    coherence = lexical.get("coherence_score", 75)
+    vocabulary = lexical.get("vocabulary_richness", 70)
+    repetition = lexical.get("repetition_index", 20)
+    deviation = baseline.deviation_score
+    w_coh, w_vocab, w_rep = _LEXICAL_RISK_WEIGHTS
+    w_acoustic, w_lex, w_dev = _COGNITIVE_RISK_WEIGHTS
 
-    cognitive_score = round(
-        acoustic_risk * 0.55 + lex_risk * 0.30 + baseline.get("deviation_score", 25) * 0.15,
-        1,
-    )
-    cognitive_score = _clamp(cognitive_score)
+    lex_risk = (100 - coherence) * w_coh + (100 - vocabulary) * w_vocab + repetition * w_rep
 
-    level = (
-        "Low" if cognitive_score < 30
-        else "Medium" if cognitive_score < 60
-        else "High"
-    )
+    cognitive_score = _q1(_clamp(acoustic_risk * w_acoustic + lex_risk * w_lex + deviation * w_dev))
 
-    confidence = round(max(0.4, min(0.95, 0.85 - abs(cognitive_score - 50) * 0.005 + random.uniform(-0.05, 0.05))), 2)
+    level = _risk_level(cognitive_score)
 
-    return {
-        "acoustic_risk_score": acoustic_risk,
-        "cognitive_risk_score": cognitive_score,
-        "neuro_risk_level": level,
-        "confidence": confidence,
-    }
+    confidence = _q2(max(0.4, min(0.95, _confidence_base(cognitive_score, True) + _uniform(-0.05, 0.05))))
+
+    return RiskReport(
+        acoustic_risk_score=acoustic_risk,
+        cognitive_risk_score=cognitive_score,
+        neuro_risk_level=level,
+        confidence=confidence,
+    )
 
 
 # ─── Explanation Generator ───────────────────────────────────────────────────
 
+_OPENER_TEMPLATES = {
+    "Low": (
+        "Overall risk assessment is **Low** (score: %.1f/100). "
+        "Voice biomarkers are within healthy parameters."
+    ),
+    "Medium": (
+        "Risk assessment is **Medium** (score: %.1f/100). "
+        "Some acoustic markers show mild deviation from expected baseline patterns."
+    ),
+    "High": (
+        "Risk assessment is **High** (score: %.1f/100). "
+        "Multiple voice biomarkers show significant deviation from baseline. "
+        "Professional evaluation is recommended."
+    ),
+}
+
+# (key, default, op, threshold, explanation template, recommendation or None)
+_FEATURE_RULES = (
+    (
+        "jitter_percent", 1.5, operator.gt, 2.0,
+        "Elevated vocal jitter ({}%) suggests increased laryngeal instability.",
+        "Consider an ENT evaluation to rule out vocal cord pathology.",
+    ),
+    (
+        "pitch_stability", 0.8, operator.lt, 0.6,
+        "Pitch stability is below normal ({:.2f}), indicating potential motor speech changes.",
+        None,
+    ),
+)
+
+_LEXICAL_RULES = (
+    (
+        "coherence_score", 80, operator.lt, 65,
+        "Lexical analysis indicates reduced semantic coherence in speech content.",
+        "Consider a brief cognitive screening (e.g., MoCA) with your primary care provider.",
+    ),
+)
+
+
 def generate_explanation(
     features: dict,
-    baseline: dict,
-    risk: dict,
+    baseline: BaselineReport,
+    risk: RiskReport,
     lexical: dict,
 ) -> tuple[str, list[str]]:
     """Generate a human-readable explanation and recommendations."""
 
-    level = risk["neuro_risk_level"]
-    acoustic = risk["acoustic_risk_score"]
-    cognitive = risk["cognitive_risk_score"]
+    level = risk.neuro_risk_level
+    acoustic = risk.acoustic_risk_score
+    cognitive = risk.cognitive_risk_score
 
     parts: list[str] = []
     recs: list[str] = []
@@ -407,41 +858,18 @@ def generate_explanation(
     display_score = cognitive if cognitive is not None else acoustic
 
     # Opening
-    if level == "Low":
-        parts.append(
-            f"Overall risk assessment is **Low** (score: {display_score:.1f}/100). "
-            "Voice biomarkers are within healthy parameters."
-        )
-    elif level == "Medium":
-        parts.append(
-            f"Risk assessment is **Medium** (score: {display_score:.1f}/100). "
-            "Some acoustic markers show mild deviation from expected baseline patterns."
-        )
-    else:
-        parts.append(
-            f"Risk assessment is **High** (score: {display_score:.1f}/100). "
-            "Multiple voice biomarkers show significant deviation from baseline. "
-            "Professional evaluation is recommended."
-        )
+    parts.append(_OPENER_TEMPLATES.get(level, _OPENER_TEMPLATES["High"]) % display_score)
 
     # Feature details
-    jitter = features.get("jitter_percent", 1.5)
-    if jitter > 2.0:
-        parts.append(f"Elevated vocal jitter ({jitter}%) suggests increased laryngeal instability.")
-        recs.append("Consider an ENT evaluation to rule out vocal cord pathology.")
+    _apply_rules(_FEATURE_RULES, features, parts, recs)
 
-    stability = features.get("pitch_stability", 0.8)
-    if stability < 0.6:
-        parts.append(f"Pitch stability is below normal ({stability:.2f}), indicating potential motor speech changes.")
-
-    if baseline.get("status") in ("significant_drift", "critical_drift"):
-        parts.append(f"Vocal Twin comparison shows {baseline['status'].replace('_', ' ')} from your stored baseline.")
+    if baseline.status in ("significant_drift", "critical_drift"):
+        parts.append(f"Vocal Twin comparison shows {baseline.status.replace('_', ' ')} from your stored baseline.")
         recs.append("Schedule a follow-up recording in 2 weeks to track progression.")
 
     # Lexical
-    if lexical and lexical.get("coherence_score", 80) < 65:
-        parts.append("Lexical analysis indicates reduced semantic coherence in speech content.")
-        recs.append("Consider a brief cognitive screening (e.g., MoCA) with your primary care provider.")
+    if lexical:
+        _apply_rules(_LEXICAL_RULES, lexical, parts, recs)
 
     if not recs:
         recs.append("Continue regular monitoring with bi-weekly voice recordings.")
@@ -450,8 +878,31 @@ def generate_explanation(
     return " ".join(parts), recs
 
 
+def _apply_rules(rules: tuple, values: dict, parts: list[str], recs: list[str]) -> None:
+    """Append the explanation / recommendation of every rule that fires."""
+    for key, default, op, threshold, part, rec in rules:
+        value = values.get(key, default)
+        if op(value, threshold):
+            parts.append(part.format(value))
+            if rec is not None:
+                recs.append(rec)
+
+
 # ─── Featherless Lexical Analysis (async, reliability-aware) ─────────────────
 
+# Upper bound on in-flight Featherless calls per process, and on the total
+# wall-clock time (waiting for a slot and retries included) one analysis
+# may take.
+LEXICAL_MAX_CONCURRENCY = int(os.getenv("LEXICAL_MAX_CONCURRENCY", "8"))
+LEXICAL_TIMEOUT_SECONDS = float(os.getenv("LEXICAL_TIMEOUT_S", "15.0"))
+_lexical_semaphore = asyncio.Semaphore(LEXICAL_MAX_CONCURRENCY)
+
+
+async def _analyze_in_slot(transcript: str, deadline: float) -> dict[str, Any]:
+    """Wait for a concurrency slot, then call Featherless (timed as one unit)."""
+    async with _lexical_semaphore:
+        return await analyze_lexical_cognition(transcript, deadline=deadline)
+
 
 async def run_lexical_analysis(transcript: str) -> dict[str, Any]:
     """
@@ -472,14 +923,39 @@ async def run_lexical_analysis(transcript: str) -> dict[str, Any]:
             "message": "No transcript available for lexical analysis.",
         }
 
+    cache_key = transcript_key(transcript)
+    cached = await get_cached_metrics(cache_key)
+    if cached is not None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Lexical analysis cache hit – concern: %s",
+                cached.get("cognitive_concern", "unknown"),
+            )
+        return cached
+
     try:
-        metrics = await analyze_lexical_cognition(transcript)
-        logger.info(
-            "Featherless lexical analysis succeeded – concern: %s",
-            metrics.get("cognitive_concern", "unknown"),
+        # The same budget, as a deadline, lets the retry loop give up early
+        # rather than sleep into the wait_for cancellation
+        deadline = asyncio.get_running_loop().time() + LEXICAL_TIMEOUT_SECONDS
+        metrics = await asyncio.wait_for(
+            _analyze_in_slot(transcript, deadline),
+            timeout=LEXICAL_TIMEOUT_SECONDS,
         )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Featherless lexical analysis succeeded – concern: %s",
+                metrics.get("cognitive_concern", "unknown"),
+            )
         metrics["status"] = "success"
+        await cache_metrics(cache_key, metrics)
         return metrics
+    except asyncio.TimeoutError:
+        logger.warning("Featherless lexical analysis timed out after %.1fs", LEXICAL_TIMEOUT_SECONDS)
+        return {
+            "status": "unavailable",
+            "error_type": "timeout",
+            "message": f"Lexical analysis timed out after {LEXICAL_TIMEOUT_SECONDS:g} seconds.",
+        }
     except ValueError as exc:
         logger.warning("Lexical analysis input error: %s", exc)
         return {
@@ -517,22 +993,18 @@ def compute_cognitive_score(metrics: dict[str, Any]) -> float:
 
     Score represents *health* (100 = best), then inverted to *risk*.
     """
-    vocab = metrics.get("vocabulary_richness", 0.5)
-    coherence = metrics.get("sentence_coherence", 0.5)
-    word_diff = metrics.get("word_finding_difficulty", 0.5)
-    repetition = metrics.get("repetition_tendency", 0.5)
-
-    # Health score (0-1, 1 = healthy)
-    health = (
-        vocab * 0.25
-        + coherence * 0.25
-        + (1.0 - word_diff) * 0.25
-        + (1.0 - repetition) * 0.25
-    )
+    w_vocab, w_coh, w_wf, w_rep = _COGNITIVE_WEIGHTS
+    get = metrics.get
 
-    # Invert to risk (0-100, 100 = highest risk)
-    risk = (1.0 - health) * 100.0
-    return round(_clamp(risk), 1)
+    # Risk = 100 × (1 − health), expanded per marker: each term is that
+    # marker's weighted shortfall from healthy, already on the 0-100 scale
+    risk = (
+        (1.0 - get("vocabulary_richness", 0.5)) * w_vocab * 100.0
+        + (1.0 - get("sentence_coherence", 0.5)) * w_coh * 100.0
+        + get("word_finding_difficulty", 0.5) * w_wf * 100.0
+        + get("repetition_tendency", 0.5) * w_rep * 100.0
+    )
+    return _q1(_clamp(risk))
 
 
 # ─── Final Neuro Risk (Acoustic + Cognitive Fusion) ──────────────────────────
@@ -540,7 +1012,7 @@ def compute_cognitive_score(metrics: dict[str, Any]) -> float:
 def compute_final_neuro_risk(
     acoustic_risk: float,
     cognitive_score: float | None = None,
-) -> dict[str, Any]:
+) -> RiskReport:
     """
     Fuse acoustic and cognitive scores into a single Neuro Risk indicator.
 
@@ -554,41 +1026,79 @@ def compute_final_neuro_risk(
     cognitive_available = cognitive_score is not None
 
     if cognitive_available:
-        final_score = round(
-            acoustic_risk * 0.6 + cognitive_score * 0.4,
-            1,
-        )
+        w_acoustic, w_cognitive = _FUSION_WEIGHTS
+        final_score = _q1(acoustic_risk * w_acoustic + cognitive_score * w_cognitive)
     else:
         # Acoustic-only mode – do not fabricate cognitive values
-        final_score = round(acoustic_risk, 1)
+        final_score = _q1(acoustic_risk)
         logger.warning(
             "Cognitive score unavailable – neuro risk based on acoustic data only."
         )
 
     final_score = _clamp(final_score)
 
-    level = (
-        "Low" if final_score < 30
-        else "Medium" if final_score < 60
-        else "High"
-    )
+    level = _risk_level(final_score)
 
     # Confidence is lower when cognitive data is missing
-    base_confidence = 0.85 if cognitive_available else 0.65
-    confidence = round(
-        max(0.3, min(0.95, base_confidence - abs(final_score - 50) * 0.005 + random.uniform(-0.05, 0.05))),
-        2,
+    base_confidence = _confidence_base(final_score, cognitive_available)
+    confidence = _q2(max(0.3, min(0.95, base_confidence + _uniform(-0.05, 0.05))))
+
+    return RiskReport(
+        acoustic_risk_score=acoustic_risk,
+        cognitive_risk_score=_q1(cognitive_score) if cognitive_available else None,
+        neuro_risk_level=level,
+        confidence=confidence,
+        cognitive_available=cognitive_available,
     )
 
-    result: dict[str, Any] = {
-        "acoustic_risk_score": acoustic_risk,
-        "cognitive_risk_score": round(cognitive_score, 1) if cognitive_available else None,
-        "neuro_risk_level": level,
-        "confidence": confidence,
-        "cognitive_available": cognitive_available,
-    }
 
-    return result
+def fuse_scores(
+    acoustic_risk: float,
+    lexical_metrics: dict[str, Any] | None = None,
+) -> RiskReport:
+    """
+    Cognitive score (when `lexical_metrics` holds a successful result) plus
+    the final fusion, for a precomputed acoustic risk.
+
+    The acoustic risk comes from compute_acoustic_risk in the worker pool or
+    from a batched compute_acoustic_risk_batch call; this part is cheap
+    enough to run on the event loop.
+    """
+    cognitive_score = None
+    if lexical_metrics is not None:
+        cognitive_score = compute_cognitive_score(lexical_metrics)
+        logger.info("Cognitive score (lexical): %.1f", cognitive_score)
+
+    return compute_final_neuro_risk(acoustic_risk, cognitive_score)
+
+
+def warmup_kernels() -> None:
+    """
+    Compile the scoring kernels ahead of the first request.
+
+    Called from the FastAPI lifespan and the pool worker initializer so the
+    first /api/analyze request does not pay numba's import and compile
+    latency.  A no-op cost when numba is missing.
+    """
+    _feature_matrix_kernel(np.zeros((1, 8), dtype=np.float64), np.empty((1, 28), dtype=np.float64))
+    _risk_kernel(np.zeros((1, 5), dtype=np.float64), np.empty(1, dtype=np.float64))
+
+
+def warmup_model() -> bool:
+    """
+    Load the ML model and run one throwaway inference.
+
+    Called from the pool worker initializer so the artifact load and the
+    first-inference setup of the ONNX Runtime session / sklearn estimator
+    happen before traffic.  Returns whether the model is ready.
+    """
+    if not _ensure_model_loaded():
+        return False
+    try:
+        _predict_proba(build_model_feature_vector({}).reshape(1, -1))
+    except Exception as exc:
+        logger.warning("ML warm-up inference failed: %s", exc)
+    return True
 
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
@@ -597,7 +1107,104 @@ def _clamp(v: float, lo: float = 0.0, hi: float = 100.0) -> float:
     return max(lo, min(hi, v))
 
 
-def _sigmoid_risk(value: float, center: float, steepness: float) -> float:
-    """Sigmoid mapping: values above center → higher risk (0-100)."""
-    x = (value - center) * steepness
-    return 100.0 / (1.0 + math.exp(-x))
+def _uniform(lo: float, hi: float) -> float:
+    """Uniform draw in [lo, hi) from this thread's prebatched stream."""
+    return lo + (hi - lo) * next(_noise.uniforms)
+
+
+def _baseline_noise() -> list[float]:
+    """One [mfcc, pitch, rhythm] drift-noise row from this thread's stream."""
+    return next(_noise.baseline_rows)
+
+
+def _q1(v: float) -> float:
+    """Round a score already clamped to [0, 100] to 1 decimal (half-up)."""
+    return int(v * 10.0 + 0.5) / 10.0
+
+
+def _q2(v: float) -> float:
+    """Round a score already clamped to [0, 100] to 2 decimals (half-up)."""
+    return int(v * 100.0 + 0.5) / 100.0
+
+
+def _q1_batch(v: np.ndarray) -> np.ndarray:
+    """_q1 over an array of clamped scores, in place: floor(v * 10 + 0.5) / 10."""
+    v *= 10.0
+    v += 0.5
+    np.floor(v, out=v)
+    v /= 10.0
+    return v
+
+
+def _confidence_base(score: float, cognitive_available: bool) -> float:
+    """Look up the pre-jitter confidence for a clamped, 0.1-quantized score."""
+    curve = _CONF_CURVE_AVAIL if cognitive_available else _CONF_CURVE_NOAVAIL
+    return curve[int(score * 10.0 + 0.5)]
+
+
+def _risk_level(score: float) -> str:
+    """Map a 0-100 score to its Low / Medium / High band."""
+    return _LEVELS[bisect.bisect_right(_LEVEL_THRESHOLDS, score)]
+
+
+def _sigmoid_risk(
+    value: np.ndarray,
+    center: float,
+    steepness: float,
+    *,
+    out: np.ndarray,
+    tmp: np.ndarray,
+) -> np.ndarray:
+    """
+    Sigmoid-shaped mapping: values above center → higher risk (0-100).
+
+    Uses the softsign curve 0.5·(1 + x/(1+|x|)) instead of exp — monotone
+    and saturating, which is all the risk bands need.  Computed in place
+    into `out`, with `tmp` as same-length scratch.
+    """
+    np.subtract(value, center, out=out)
+    out *= steepness
+    np.clip(out, -8.0, 8.0, out=out)
+    np.abs(out, out=tmp)
+    tmp += 1.0
+    out /= tmp
+    out += 1.0
+    out *= 50.0
+    return out
+
+
+class _Scratch(threading.local):
+    """Grow-only per-thread work buffer for the NumPy batch path."""
+
+    def __init__(self) -> None:
+        self.buf: np.ndarray | None = None
+
+    def get(self, rows: int, n: int) -> np.ndarray:
+        if self.buf is None or self.buf.shape[0] < rows or self.buf.shape[1] < n:
+            self.buf = np.empty((rows, n), dtype=np.float64)
+        return self.buf[:rows, :n]
+
+
+_scratch = _Scratch()
+
+
+class _Noise(threading.local):
+    """Per-thread demo-noise generator and its prebatched draw streams."""
+
+    def __init__(self) -> None:
+        self.rng = np.random.default_rng()
+        self.uniforms = self._stream(lambda: self.rng.random(_RNG_BUFFER_SIZE))
+        self.baseline_rows = self._stream(
+            lambda: self.rng.uniform(
+                _BASELINE_NOISE_LOW, _BASELINE_NOISE_HIGH, size=(_RNG_BUFFER_SIZE, 3)
+            )
+        )
+
+    @staticmethod
+    def _stream(draw_block):
+        """Endless iterator over blocks of draws, refilled one block at a time."""
+        while True:
+            yield from draw_block().tolist()
+
+
+_noise = _Noise()
@@ -4,13 +4,31 @@ Groq Whisper Speech-to-Text transcription service.
 
 from __future__ import annotations
 
+import io
 import os
 import logging
 import httpx
+import orjson
 
 logger = logging.getLogger("cognitive-echo")
 
-async def transcribe_audio(audio_bytes: bytes) -> str | None:
+GROQ_TRANSCRIPTION_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
+REQUEST_TIMEOUT_SECONDS = 60.0
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared client so each transcription reuses a warm TLS connection to Groq
+# instead of handshaking again. Created lazily, closed from the app lifespan.
+_http_client: httpx.AsyncClient | None = None
+
+
+async def transcribe_audio(audio_bytes: bytes | bytearray) -> str | None:
     """
     Transcribe raw audio bytes using Groq's whisper-large-v3 endpoint.
     Returns the transcript string on success, or None on failure.
@@ -22,30 +40,31 @@ async def transcribe_audio(audio_bytes: bytes) -> str | None:
 
     logger.info("📝 Transcription started (%d bytes)", len(audio_bytes))
 
-    url = "https://api.groq.com/openai/v1/audio/transcriptions"
     headers = {
         "Authorization": f"Bearer {api_key}"
     }
     
     # We pass the bytes directly. Groq inherently detects webm/wav magic bytes.
+    # Wrapping in BytesIO lets httpx stream any bytes-like buffer in chunks.
     files = {
-        "file": ("audio.wav", audio_bytes, "audio/wav")
+        "file": ("audio.wav", io.BytesIO(audio_bytes), "audio/wav")
     }
     data = {
         "model": "whisper-large-v3"
     }
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, data=data, files=files)
-            response.raise_for_status()
-            
-            result = response.json()
-            transcript = result.get("text", "").strip()
-            
-            preview = transcript if len(transcript) <= 50 else transcript[:47] + "..."
-            logger.info('✅ Transcript received (%d chars): "%s"', len(transcript), preview)
-            return transcript
+        response = await _get_client().post(
+            GROQ_TRANSCRIPTION_URL, headers=headers, data=data, files=files
+        )
+        response.raise_for_status()
+
+        result = orjson.loads(response.content)
+        transcript = result.get("text", "").strip()
+
+        preview = transcript if len(transcript) <= 50 else transcript[:47] + "..."
+        logger.info('✅ Transcript received (%d chars): "%s"', len(transcript), preview)
+        return transcript
 
     except httpx.HTTPStatusError as e:
         logger.error("❌ Groq STT failed: HTTP %d - %s — lexical analysis will be skipped", e.response.status_code, e.response.text)
@@ -53,3 +72,23 @@ async def transcribe_audio(audio_bytes: bytes) -> str | None:
     except Exception as e:
         logger.error("❌ Groq STT failed: %s — lexical analysis will be skipped", str(e))
         return None
+
+
+async def aclose_http_client() -> None:
+    """Close the shared Groq HTTP client (call on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared pooled client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            http2=HTTP2_AVAILABLE,
+        )
+    return _http_client